@@ -3,8 +3,6 @@
 # libs:
 import numpy as np
 import time
-import matplotlib.pyplot as plt
-from mpl_toolkits.mplot3d import Axes3D
 from abc import ABC, abstractmethod
 
 # class for simulator:
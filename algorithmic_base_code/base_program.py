@@ -1,12 +1,12 @@
 # basic test program:
-mport numpy as np
+import numpy as np
 import time
-import matplotlib.pyplot as plt
-from mpl_toolkits.mplot3d import Axes3D
+from recorder import TrajectoryRecorder
+from termination import Termination
 
 # Drone simulation class:
 class Dronesim:
-    def __init__(self):
+    def __init__(self, history_decimation=1, history_window=None):
         # Initial state [x, y, z, vx, vy, vz]
         self.state = np.array([0.0, 0.0, 0.0, 0.0, 0.0, 0.0])
 
@@ -20,10 +20,15 @@ class Dronesim:
         self.max_tilt = np.pi/4  # 45 degrees
         
         # History for plotting
-        self.position_history = []
-        self.time_history = []
+        self.steps = 0
+        self.recorder = TrajectoryRecorder(3, decimation=history_decimation,
+                                           window=history_window)
 
     def dynamics(self, control_input):
+        return self.derivatives(self.state, control_input)
+
+    def derivatives(self, state, control_input):
+        """State derivatives at a given state (used by the adaptive integrator)"""
 
         # control_input = [thrust, roll_angle, pitch_angle]
         thrust = np.clip(control_input[0], 0, self.max_thrust)
@@ -31,7 +36,7 @@ class Dronesim:
         pitch = np.clip(control_input[2], -self.max_tilt, self.max_tilt)
 
         # Current state
-        x, y, z, vx, vy, vz = self.state
+        x, y, z, vx, vy, vz = state
         
         # Calculate accelerations
         ax = (thrust/self.mass) * np.sin(pitch)
@@ -43,17 +48,33 @@ class Dronesim:
         return derivatives
     
     def update(self, control_input):
+        self.integrate(control_input)
+        self.record()
 
-        k1 = self.dynamics(control_input)
-        k2 = self.dynamics(control_input) * self.dt/2 + k1
-        k3 = self.dynamics(control_input) * self.dt/2 + k2
-        k4 = self.dynamics(control_input) * self.dt + k3
+    def integrate(self, control_input):
+        # RK4, each stage evaluated at its own intermediate state
+        k1 = self.derivatives(self.state, control_input)
+        k2 = self.derivatives(self.state + k1 * self.dt/2, control_input)
+        k3 = self.derivatives(self.state + k2 * self.dt/2, control_input)
+        k4 = self.derivatives(self.state + k3 * self.dt, control_input)
         
         self.state += (self.dt/6.0) * (k1 + 2*k2 + 2*k3 + k4)
 
-        # Store history
-        self.position_history.append(self.state[:3].copy())
-        self.time_history.append(len(self.time_history) * self.dt)
+    def record(self, t=None):
+        # Store history; by default the state is stamped with the time after
+        # the step that produced it, as telemetry and termination are
+        self.recorder.record((self.steps + 1) * self.dt if t is None else t, self.state[:3])
+        self.steps += 1
+
+    # recorded positions as a (n, 3) view
+    @property
+    def position_history(self):
+        return self.recorder.values
+
+    # recorded sample times as a (n,) view
+    @property
+    def time_history(self):
+        return self.recorder.times
 
     # getting the position of UAV
     def get_position(self):
@@ -61,7 +82,7 @@ class Dronesim:
     
     # getting the velocity of UAV
     def get_velocity(self):
-        return self.state[:3]
+        return self.state[3:]
     
 # Flight controller class:
 class FlightController:
@@ -102,7 +123,7 @@ class FlightController:
         return np.array([thrust, roll, pitch])
     
 # function for running simulation:
-def run_simulation():
+def run_simulation(termination=None):
     # Initialize simulator and controller
     drone = Dronesim()
     controller = FlightController()
@@ -114,8 +135,13 @@ def run_simulation():
     sim_time = 10.0  # seconds
     steps = int(sim_time / drone.dt)
     
+    # Stop early once settled or diverged
+    if termination is None:
+        termination = Termination()
+    termination.reset()
+
     # Run simulation
-    for _ in range(steps):
+    for step in range(steps):
         current_pos = drone.get_position()
         current_vel = drone.get_velocity()
         
@@ -124,13 +150,26 @@ def run_simulation():
         
         # Update simulation
         drone.update(control_input)
+
+        error = np.linalg.norm(drone.state[:3] - target)
+        speed = np.linalg.norm(drone.state[3:])
+        if termination.check((step + 1) * drone.dt, error, speed):
+            break
+
+    print(f"Stopped: {termination.reason or 'time_limit'} after {termination.steps} steps")
+    if termination.settling_time is not None:
+        print(f"Settling time: {termination.settling_time:.2f} s")
     
     # Plot results
     plot_trajectory(drone.position_history, target)
 
 # function for plotting the drone trajectory:
 def plot_trajectory(position_history, target):
-    positions = np.array(position_history)
+    # Plotting is only imported when used, so the simulator stays NumPy-only
+    import matplotlib.pyplot as plt
+    from mpl_toolkits.mplot3d import Axes3D
+
+    positions = np.asarray(position_history)
     
     fig = plt.figure(figsize=(10, 8))
     ax = fig.add_subplot(111, projection='3d')
@@ -0,0 +1,68 @@
+# PID controller working on many drones per call:
+
+# libs:
+import numpy as np
+
+# class for batched PID controller:
+class BatchPIDController:
+    def __init__(self, n_drones, kp=2.0, ki=0.1, kd=0.5, max_thrust=20.0, g=9.81):
+        self.n_drones = n_drones
+
+        # Per-drone PID gains, shape (N, 1) so they broadcast over x, y, z
+        self.kp = self._per_drone(kp)
+        self.ki = self._per_drone(ki)
+        self.kd = self._per_drone(kd)
+        self.max_thrust = np.broadcast_to(np.asarray(max_thrust, dtype=float), (n_drones,)).copy()
+        self.g = g
+
+        # Error accumulation for integral term
+        self.error_integral = np.zeros((n_drones, 3))
+
+        # Work buffers reused on every call
+        self._error = np.empty((n_drones, 3))
+        self._control = np.empty((n_drones, 3))
+        self._scratch = np.empty((n_drones, 3))
+        self._output = np.empty((n_drones, 3))
+
+    def _per_drone(self, value):
+        value = np.broadcast_to(np.asarray(value, dtype=float), (self.n_drones,))
+        return value.reshape(self.n_drones, 1).copy()
+
+    def reset(self, mask=None):
+        """Clears the integral term for all drones or the ones selected by mask"""
+        if mask is None:
+            self.error_integral[:] = 0.0
+        else:
+            self.error_integral[mask] = 0.0
+
+    def control(self, current_pos, target_pos, current_vel, out=None):
+        """Returns (N, 3) control inputs [thrust, roll, pitch] for (N, 3) inputs"""
+        if out is None:
+            out = self._output
+        error = self._error
+        control = self._control
+        scratch = self._scratch
+
+        np.subtract(target_pos, current_pos, out=error)
+
+        # Update integral term
+        self.error_integral += error
+
+        # control = kp * error + ki * integral - kd * velocity
+        np.multiply(self.kp, error, out=control)
+        np.multiply(self.ki, self.error_integral, out=scratch)
+        control += scratch
+        np.multiply(self.kd, current_vel, out=scratch)
+        control -= scratch
+
+        # Thrust is |control| + g, so it never drops to zero and the angles are always defined
+        thrust = out[:, 0]
+        np.multiply(control, control, out=scratch)
+        np.sum(scratch, axis=1, out=thrust)
+        np.sqrt(thrust, out=thrust)
+        thrust += self.g
+        np.clip(thrust, 0, self.max_thrust, out=thrust)
+
+        np.arctan2(control[:, 1], control[:, 2], out=out[:, 1])  # roll
+        np.arctan2(control[:, 0], control[:, 2], out=out[:, 2])  # pitch
+        return out
@@ -0,0 +1,111 @@
+# vectorized simulator for stepping many drones at once:
+
+# libs:
+import numpy as np
+import time
+
+# Batch drone simulation class:
+class BatchDronesim:
+    def __init__(self, n_drones, mass=1.0, max_thrust=20.0, max_tilt=np.pi/4,
+                 dt=0.01, initial_states=None):
+        self.n_drones = n_drones
+
+        # States [x, y, z, vx, vy, vz] for every drone, shape (N, 6)
+        if initial_states is None:
+            self.states = np.zeros((n_drones, 6))
+        else:
+            self.states = np.array(initial_states, dtype=float).reshape(n_drones, 6)
+
+        # Physical parameters (scalars are broadcast to one value per drone)
+        self.mass = self._per_drone(mass)
+        self.g = 9.81
+        self.dt = dt
+        self.time = 0.0
+
+        # Control limits
+        self.max_thrust = self._per_drone(max_thrust)
+        self.max_tilt = self._per_drone(max_tilt)
+
+        # Work buffers reused on every step
+        self._accel = np.empty((n_drones, 3))
+        self._k = np.empty((4, n_drones, 6))
+        self._stage = np.empty((n_drones, 6))
+
+    def _per_drone(self, value):
+        return np.broadcast_to(np.asarray(value, dtype=float), (self.n_drones,)).copy()
+
+    def accelerations(self, controls, out=None):
+        """Returns (N, 3) accelerations for (N, 3) controls [thrust, roll, pitch]"""
+        if out is None:
+            out = np.empty((self.n_drones, 3))
+        controls = np.asarray(controls, dtype=float)
+
+        thrust = np.clip(controls[:, 0], 0, self.max_thrust)
+        roll = np.clip(controls[:, 1], -self.max_tilt, self.max_tilt)
+        pitch = np.clip(controls[:, 2], -self.max_tilt, self.max_tilt)
+
+        specific_thrust = thrust / self.mass
+        np.multiply(specific_thrust, np.sin(pitch), out=out[:, 0])
+        np.multiply(specific_thrust, np.sin(roll), out=out[:, 1])
+        np.multiply(specific_thrust, np.cos(roll) * np.cos(pitch), out=out[:, 2])
+        out[:, 2] -= self.g
+        return out
+
+    def dynamics(self, states, accel, out):
+        """Writes the state derivatives of every drone into out"""
+        out[:, :3] = states[:, 3:]
+        out[:, 3:] = accel
+        return out
+
+    def update(self, controls, disturbance=None):
+        """Advances all drones by one RK4 step, holding controls over the step.
+
+        disturbance is an optional (N, 3) acceleration (e.g. wind) added to
+        every drone and held over the step as well.
+        """
+        accel = self.accelerations(controls, out=self._accel)
+        if disturbance is not None:
+            accel += disturbance
+        dt = self.dt
+        k1, k2, k3, k4 = self._k
+        stage = self._stage
+
+        self.dynamics(self.states, accel, k1)
+        np.multiply(k1, dt/2, out=stage)
+        stage += self.states
+        self.dynamics(stage, accel, k2)
+        np.multiply(k2, dt/2, out=stage)
+        stage += self.states
+        self.dynamics(stage, accel, k3)
+        np.multiply(k3, dt, out=stage)
+        stage += self.states
+        self.dynamics(stage, accel, k4)
+
+        # states += dt/6 * (k1 + 2*k2 + 2*k3 + k4), without temporaries
+        k2 += k3
+        k2 *= 2
+        k2 += k1
+        k2 += k4
+        k2 *= dt/6.0
+        self.states += k2
+        self.time += dt
+
+    # getting the positions of all UAVs, shape (N, 3)
+    def get_positions(self):
+        return self.states[:, :3]
+
+    # getting the velocities of all UAVs, shape (N, 3)
+    def get_velocities(self):
+        return self.states[:, 3:]
+
+# running a quick throughput check:
+if __name__ == "__main__":
+    for n in (1, 100, 10000):
+        sim = BatchDronesim(n)
+        hover = np.tile([sim.g * 1.0, 0.0, 0.0], (n, 1))
+        steps = 1000
+        start = time.perf_counter()
+        for _ in range(steps):
+            sim.update(hover)
+        elapsed = time.perf_counter() - start
+        print(f"N={n:6d}: {n * steps / elapsed:,.0f} drone-steps/s")
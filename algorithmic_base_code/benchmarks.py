@@ -0,0 +1,158 @@
+# benchmark suite for simulator, controller and runner throughput:
+#
+#   python benchmarks.py --output bench.json
+#   python benchmarks.py --output new.json --compare bench.json --threshold 0.10
+
+# libs:
+import argparse
+import json
+import platform
+import sys
+import time
+import tracemalloc
+import numpy as np
+
+from base_program import Dronesim, FlightController
+from batch_sim import BatchDronesim
+from batch_controller import BatchPIDController
+from sample_code import PIDController
+from run_simulation import run_simulation
+
+TARGET = np.array([5.0, 5.0, 10.0])
+
+def best_rate(fn, work, repeat=7, min_time=0.2):
+    """Returns (best work-per-second, noise) for fn() doing work units.
+
+    Like timeit.autorange, fn() is called in batches of loops calls, with
+    loops doubled until a batch takes at least min_time; repeat batches are
+    then timed. noise is the relative gap between the median and best batch.
+    """
+    def batch(loops):
+        start = time.perf_counter()
+        for _ in range(loops):
+            fn()
+        return time.perf_counter() - start
+
+    loops = 1
+    while batch(loops) < min_time:
+        loops *= 2
+    times = np.array([batch(loops) for _ in range(repeat)])
+    best = times.min()
+    return work * loops / best, float(np.median(times) / best - 1.0)
+
+def bench_dronesim_update(steps=5000):
+    drone = Dronesim()
+    hover = np.array([9.81, 0.0, 0.0])
+    def run():
+        for _ in range(steps):
+            drone.update(hover)
+    return best_rate(run, steps)
+
+def bench_batch_update(n, steps=200):
+    sim = BatchDronesim(n)
+    hover = np.tile([9.81, 0.0, 0.0], (n, 1))
+    def run():
+        for _ in range(steps):
+            sim.update(hover)
+    return best_rate(run, n * steps)
+
+def bench_flight_controller(calls=5000):
+    controller = FlightController()
+    pos, vel = np.zeros(3), np.zeros(3)
+    def run():
+        for _ in range(calls):
+            controller.control(pos, TARGET, vel)
+    return best_rate(run, calls)
+
+def bench_batch_controller(n, calls=200):
+    controller = BatchPIDController(n)
+    pos, vel = np.zeros((n, 3)), np.zeros((n, 3))
+    targets = np.broadcast_to(TARGET, (n, 3))
+    def run():
+        for _ in range(calls):
+            controller.control(pos, targets, vel)
+    return best_rate(run, n * calls)
+
+def bench_run_simulation():
+    rate, noise = best_rate(lambda: run_simulation(PIDController(), target=TARGET, plot=False),
+                            1, repeat=5)
+    return 1.0 / rate, noise
+
+def bench_history_memory(steps=100000):
+    drone = Dronesim()
+    hover = np.array([9.81, 0.0, 0.0])
+    tracemalloc.start()
+    for _ in range(steps):
+        drone.update(hover)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return peak / 1e6, 0.0
+
+def run_benchmarks(sizes=(1, 10, 100, 1000, 10000)):
+    """Returns {name: {"value", "noise", "unit", "higher_is_better"}}"""
+    results = {}
+    def add(name, measured, unit, higher_is_better=True):
+        value, noise = measured
+        results[name] = {"value": float(value), "noise": noise, "unit": unit,
+                         "higher_is_better": higher_is_better}
+        print(f"{name:32s} {value:18,.3f} {unit:14s} ±{noise:.1%}")
+
+    add("dronesim_update", bench_dronesim_update(), "steps/s")
+    for n in sizes:
+        add(f"batch_update_n{n}", bench_batch_update(n), "drone-steps/s")
+    add("flight_controller", bench_flight_controller(), "calls/s")
+    for n in sizes:
+        add(f"batch_controller_n{n}", bench_batch_controller(n), "drone-calls/s")
+    add("run_simulation", bench_run_simulation(), "s", higher_is_better=False)
+    add("history_peak_memory_100k", bench_history_memory(), "MB", higher_is_better=False)
+    return results
+
+def compare(results, baseline, threshold=0.10, noise_factor=3.0):
+    """Returns the names of benchmarks that got worse than the relative
+    threshold, widened to noise_factor times the noisier of the two runs"""
+    regressions = []
+    for name, base in baseline.items():
+        if name not in results or base["value"] == 0:
+            continue
+        change = results[name]["value"] / base["value"] - 1.0
+        worse = -change if base["higher_is_better"] else change
+        limit = max(threshold, noise_factor * max(base.get("noise", 0.0), results[name]["noise"]))
+        flag = "REGRESSION" if worse > limit else ""
+        print(f"{name:32s} {change:+8.1%}  (limit {limit:.1%}) {flag}")
+        if worse > limit:
+            regressions.append(name)
+    return regressions
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Simulator throughput benchmarks")
+    parser.add_argument("--output", help="write results to this JSON file")
+    parser.add_argument("--compare", help="baseline JSON file to compare against")
+    parser.add_argument("--threshold", type=float, default=0.10,
+                        help="relative slowdown reported as a regression")
+    parser.add_argument("--noise-factor", type=float, default=3.0,
+                        help="widen the threshold to this multiple of the measured noise")
+    args = parser.parse_args(argv)
+
+    results = run_benchmarks()
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump({
+                "meta": {
+                    "python": platform.python_version(),
+                    "numpy": np.__version__,
+                    "machine": platform.machine(),
+                    "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S"),
+                },
+                "results": results,
+            }, f, indent=2)
+
+    if args.compare:
+        with open(args.compare) as f:
+            baseline = json.load(f)["results"]
+        print(f"\nCompared with {args.compare}:")
+        if compare(results, baseline, args.threshold, args.noise_factor):
+            return 1
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,21 @@
+# headless simulation core (NumPy only):
+# importing this never loads matplotlib or pygame; plot_trajectory and the
+# pygame front-ends import their libraries only when they are used.
+
+from base_controller import BaseController
+from base_program import Dronesim, FlightController, plot_trajectory
+from sample_code import PIDController, WaypointController
+from batch_sim import BatchDronesim
+from batch_controller import BatchPIDController
+from recorder import TrajectoryRecorder
+from termination import Termination
+from integrators import DormandPrince45, DenseSolution, simulate_adaptive
+from events import Event, ground_contact, altitude_crossing, waypoint_arrival
+from run_simulation import run_simulation
+from parallel_runner import build_scenarios, run_sweep
+from sensors import GPS, Barometer, IMU, AGLSensor
+from trajectory import MinimumJerkTrajectory
+from swarm import SpatialHash, Swarm
+from world import World, ClearanceMonitor, load_world
+from terrain import Terrain, create_heightmap, write_heightmap
+from windfield import WindField
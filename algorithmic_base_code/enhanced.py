@@ -21,8 +21,15 @@ def run_simulation(controller, target=None, waypoints=None):
 
 # adding environmental factors:
 class DroneSimulator:
+    def __init__(self, seed=0, trial_index=0):
+        # ... existing code ...
+        # Turbulence generated once and cached on disk (see windfield.py)
+        self.wind = WindField(mean=(2.0, 0.0, 0.0), sigma=0.5, seed=seed, cache_dir="wind_cache")
+        self.wind_offset = np.random.default_rng([seed, trial_index, 2]).uniform(
+            0, self.wind.shape * self.wind.spacing)  # Each trial flies a different region
+        self.time = 0.0
+
     def dynamics(self, control_input):
         derivatives = # ... existing code ...
-        wind = np.random.normal(0, 0.1, 3)  # Random wind gusts
-        derivatives[3:] += wind
+        derivatives[3:] += self.wind.disturbance(self.state, self.time, self.wind_offset)[0]  # Drag from wind
         return derivatives
@@ -0,0 +1,74 @@
+# events located precisely inside integration steps:
+
+# libs:
+import numpy as np
+
+# class for an event g(t, state) = 0:
+class Event:
+    def __init__(self, function, direction=0, terminal=False, action=None, name=None):
+        """function(t, state) changes sign at the event.
+
+        direction > 0 only fires when g rises through zero, < 0 when it falls,
+        0 for both. A terminal event stops the run at the crossing; otherwise
+        action(t, state), if given, may return a new state to continue from
+        (e.g. to switch modes).
+        """
+        self.function = function
+        self.direction = direction
+        self.terminal = terminal
+        self.action = action
+        self.name = name or getattr(function, "__name__", "event")
+
+    def __call__(self, t, state):
+        return self.function(t, state)
+
+    def crossed(self, g_old, g_new):
+        if self.direction >= 0 and g_old < 0 <= g_new:
+            return True
+        if self.direction <= 0 and g_old > 0 >= g_new:
+            return True
+        return False
+
+def locate(event, interpolant, t_old, t_new, g_old, g_new, xtol=1e-10):
+    """Finds the crossing of event between t_old and t_new (Illinois method).
+
+    interpolant(t) returns the state inside the step. The returned time is
+    the bracket end past the crossing, so restarting there does not fire
+    the same event again.
+    """
+    a, b = t_old, t_new
+    ga, gb = g_old, g_new
+    side = 0
+    while b - a > xtol * max(1.0, abs(b)):
+        t = b - gb * (b - a) / (gb - ga)
+        t = min(max(t, a + 0.01 * (b - a)), b - 0.01 * (b - a))  # Stay inside the bracket
+        g = event(t, interpolant(t))
+        if event.crossed(ga, g):
+            b, gb = t, g
+            if side == -1:
+                ga /= 2
+            side = -1
+        else:
+            a, ga = t, g
+            if side == 1:
+                gb /= 2
+            side = 1
+    return b
+
+# common events for the drone state [x, y, z, vx, vy, vz]:
+def ground_contact(ground=0.0, terminal=True):
+    """ground is a flat altitude or a Terrain (see terrain.py)"""
+    if hasattr(ground, "elevation"):
+        return Event(lambda t, s: s[2] - ground.elevation(s[:2]), direction=-1,
+                     terminal=terminal, name="ground_contact")
+    return Event(lambda t, s: s[2] - ground, direction=-1, terminal=terminal,
+                 name="ground_contact")
+
+def altitude_crossing(altitude, direction=0, terminal=False):
+    return Event(lambda t, s: s[2] - altitude, direction=direction, terminal=terminal,
+                 name=f"altitude_{altitude:g}")
+
+def waypoint_arrival(waypoint, radius=0.1, terminal=True):
+    waypoint = np.asarray(waypoint, dtype=float)
+    return Event(lambda t, s: np.linalg.norm(s[:3] - waypoint) - radius, direction=-1,
+                 terminal=terminal, name="waypoint_arrival")
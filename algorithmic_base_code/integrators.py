@@ -0,0 +1,229 @@
+# adaptive integration with error control and dense output:
+
+# libs:
+import numpy as np
+from events import locate
+
+# Dormand-Prince 5(4) coefficients
+C = np.array([0, 1/5, 3/10, 4/5, 8/9, 1])
+A = [
+    np.array([]),
+    np.array([1/5]),
+    np.array([3/40, 9/40]),
+    np.array([44/45, -56/15, 32/9]),
+    np.array([19372/6561, -25360/2187, 64448/6561, -212/729]),
+    np.array([9017/3168, -355/33, 46732/5247, 49/176, -5103/18656]),
+]
+B = np.array([35/384, 0, 500/1113, 125/192, -2187/6784, 11/84])
+# Difference between the 5th and 4th order solutions, including the FSAL stage
+E = np.array([-71/57600, 0, 71/16695, -71/1920, 17253/339200, -22/525, 1/40])
+# Continuous extension: y(t0 + x*h) = y0 + h * K.T @ P @ [x, x^2, x^3, x^4]
+P = np.array([
+    [1, -8048581381/2820520608, 8663915743/2820520608, -12715105075/11282082432],
+    [0, 0, 0, 0],
+    [0, 131558114200/32700410799, -68118460800/10900136933, 87487479700/32700410799],
+    [0, -1754552775/470086768, 14199869525/1410260304, -10690763975/1880347072],
+    [0, 127303824393/49829197408, -318862633887/49829197408, 701980252875/199316789632],
+    [0, -282668133/205662961, 2019193451/616988883, -1453857185/822651844],
+    [0, 40617522/29380423, -110615467/29380423, 69997945/29380423],
+])
+
+# class for dense output over many accepted steps:
+class DenseSolution:
+    def __init__(self):
+        self.t_start = []
+        self.h = []
+        self.y_start = []
+        self.Q = []
+        self.events = []  # (name, t, state) for every event that fired
+
+    def add(self, t, h, y, Q, t_stop=None):
+        """Adds a step of length h; t_stop < t + h keeps only its first part
+        (e.g. up to a terminal event)"""
+        if t_stop is not None and t_stop < t + h:
+            if t_stop <= t:
+                return
+            # Same polynomial, reparameterized over the shorter step
+            scale = (t_stop - t) / h
+            Q = Q * scale ** np.arange(4)
+            h = t_stop - t
+        self.t_start.append(t)
+        self.h.append(h)
+        self.y_start.append(y.copy())
+        self.Q.append(Q)
+
+    def __len__(self):
+        return len(self.t_start)
+
+    def __call__(self, t):
+        """Samples the solution at the times in t, returns shape (len(t), n).
+        Times outside the integrated span are clamped to its ends."""
+        t_start = np.asarray(self.t_start)
+        t = np.clip(np.atleast_1d(np.asarray(t, dtype=float)), t_start[0], t_start[-1] + self.h[-1])
+        segment = np.clip(np.searchsorted(t_start, t, side='right') - 1, 0, len(t_start) - 1)
+
+        h = np.asarray(self.h)[segment]
+        x = (t - t_start[segment]) / h
+        powers = np.cumprod(np.repeat(x[:, None], 4, axis=1), axis=1)
+        Q = np.asarray(self.Q)[segment]
+        y0 = np.asarray(self.y_start)[segment]
+        return y0 + h[:, None] * np.einsum('snk,sk->sn', Q, powers)
+
+def step_interpolant(t, h, y, Q):
+    """Dense output inside one accepted step"""
+    def interpolant(t_query):
+        x = (t_query - t) / h
+        return y + h * (Q @ np.array([x, x * x, x ** 3, x ** 4]))
+    return interpolant
+
+# class for the adaptive integrator:
+class DormandPrince45:
+    def __init__(self, rtol=1e-6, atol=1e-8, max_step=np.inf, first_step=None):
+        self.rtol = rtol
+        self.atol = atol
+        self.max_step = max_step
+        self.h = first_step  # Carried over between integrate() calls
+        self.nfev = 0
+        self.accepted = 0
+        self.rejected = 0
+        self.hits = []  # Events fired during the last integrate() call
+        self.f = None   # fun at the end of the last call, reusable as the next f0
+
+    def _initial_step(self, y, f):
+        scale = self.atol + np.abs(y) * self.rtol
+        d0 = np.sqrt(np.mean((y / scale) ** 2))
+        d1 = np.sqrt(np.mean((f / scale) ** 2))
+        return 1e-6 if d0 < 1e-5 or d1 < 1e-5 else 0.01 * d0 / d1
+
+    def integrate(self, fun, t0, y0, t_end, solution=None, events=(), f0=None):
+        """Integrates dy/dt = fun(t, y) from t0 to t_end and returns y(t_end).
+
+        Accepted steps are appended to solution for dense output. Event
+        crossings are located inside each step; a terminal event ends the
+        call early at the crossing (check self.hits and self.t). f0, if
+        given, is fun(t0, y0) (e.g. self.f from a previous call with the
+        same fun) and saves one evaluation.
+        """
+        t = t0
+        y = np.array(y0, dtype=float)
+        if f0 is None:
+            f = fun(t, y)
+            self.nfev += 1
+        else:
+            f = f0
+        self.hits = []
+        g = [event(t, y) for event in events]
+        K = np.empty((7, len(y)))
+        h = self.h if self.h is not None else self._initial_step(y, f)
+
+        while t < t_end:
+            h_step = min(h, self.max_step, t_end - t)
+            clipped = h_step < h
+            K[0] = f
+            for stage in range(1, 6):
+                dy = A[stage] @ K[:stage] * h_step
+                K[stage] = fun(t + C[stage] * h_step, y + dy)
+            y_new = y + h_step * (B @ K[:6])
+            f_new = fun(t + h_step, y_new)
+            K[6] = f_new
+            self.nfev += 6
+
+            scale = self.atol + np.maximum(np.abs(y), np.abs(y_new)) * self.rtol
+            error = np.sqrt(np.mean((h_step * (E @ K) / scale) ** 2))
+
+            if error <= 1.0:
+                Q = K.T @ P
+                t_new = t_end if h_step == t_end - t else t + h_step
+                self.accepted += 1
+                factor = 10.0 if error == 0 else min(10.0, 0.9 * error ** -0.2)
+                # A step shortened to land on t_end says nothing against the longer one
+                h = max(h, h_step * factor) if clipped else h_step * factor
+
+                hit = self._first_event(events, g, t, t_new, step_interpolant(t, h_step, y, Q), y_new)
+                if solution is not None:
+                    # Dense output stops at an event; the state may jump there
+                    solution.add(t, h_step, y, Q, None if hit is None else hit[1])
+                if hit is None:
+                    t, y, f = t_new, y_new, f_new
+                    g = [event(t, y) for event in events]
+                    continue
+
+                # Restart from the event
+                event, t, y = hit
+                self.hits.append(hit)
+                if solution is not None:
+                    solution.events.append((event.name, t, y.copy()))
+                if event.terminal:
+                    f = None  # f belongs to the step end, not the event
+                    break
+                if event.action is not None:
+                    new_y = event.action(t, y)
+                    y = y if new_y is None else np.array(new_y, dtype=float)
+                f = fun(t, y)
+                self.nfev += 1
+                g = [event(t, y) for event in events]
+            else:
+                self.rejected += 1
+                h = h_step * max(0.2, 0.9 * error ** -0.2)
+
+        self.h = h
+        self.t = t
+        self.f = f
+        return y
+
+    def _first_event(self, events, g_old, t_old, t_new, interpolant, y_new):
+        """Returns (event, t, state) for the earliest crossing in the step, or None"""
+        first = None
+        for event, g0 in zip(events, g_old):
+            g1 = event(t_new, y_new)
+            if not event.crossed(g0, g1):
+                continue
+            t_event = locate(event, interpolant, t_old, t_new, g0, g1)
+            if first is None or t_event < first[1]:
+                first = (event, t_event)
+        if first is None:
+            return None
+        event, t_event = first
+        return event, t_event, y_new if t_event == t_new else interpolant(t_event)
+
+# running Dronesim with the adaptive integrator:
+def simulate_adaptive(drone, controller, target, sim_time=10.0, control_dt=0.1,
+                      integrator=None, events=()):
+    """Runs the controller every control_dt seconds and holds its output
+    (zero-order hold) while the integrator picks its own steps in between.
+    The run stops at the first terminal event (see events.py).
+
+    Every control tick restarts the integrator (the held input jumps), so
+    it costs at least one 7-evaluation step per tick. The adaptive path
+    only needs fewer evaluations than fixed RK4 at 100 Hz (4 per 0.01 s)
+    when control_dt is well above ~0.02 s; hence the 10 Hz default. While
+    the controller output does not change, the last evaluation is reused.
+
+    Returns the DenseSolution, which can be sampled at any time grid.
+    """
+    if integrator is None:
+        integrator = DormandPrince45()
+    solution = DenseSolution()
+    t = 0.0
+    previous_input = None
+
+    for tick in range(int(round(sim_time / control_dt))):
+        if getattr(controller, "needs_time", False):
+            control_input = controller.control(drone.get_position(), target,
+                                               drone.get_velocity(), t=t)
+        else:
+            control_input = controller.control(drone.get_position(), target, drone.get_velocity())
+        t_next = (tick + 1) * control_dt
+        unchanged = previous_input is not None and np.array_equal(control_input, previous_input)
+        drone.state[:] = integrator.integrate(
+            lambda _, y: drone.derivatives(y, control_input), t, drone.state, t_next,
+            solution, events, f0=integrator.f if unchanged else None)
+        previous_input = control_input
+        t = integrator.t
+
+        drone.recorder.record(t, drone.state[:3])
+        drone.steps += 1
+        if any(event.terminal for event, _, _ in integrator.hits):
+            break
+
+    return solution
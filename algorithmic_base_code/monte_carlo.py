@@ -0,0 +1,126 @@
+# Monte Carlo trials with random wind disturbances:
+
+# libs:
+import numpy as np
+from batch_sim import BatchDronesim
+from batch_controller import BatchPIDController
+from sensors import GPS
+
+# getting the random generator of one trial:
+def trial_rng(seed, trial_index):
+    """Each trial draws from its own stream, fixed by (seed, trial_index)"""
+    return np.random.default_rng([seed, trial_index])
+
+# class for wind gusts drawn in bulk:
+class WindDisturbance:
+    def __init__(self, rng, sigma=0.1, block_size=4096):
+        self.rng = rng
+        self.sigma = sigma
+        self.block_size = block_size
+        self._block = np.empty((0, 3))
+        self._index = 0
+
+    def draw(self, steps):
+        """Returns a (steps, 3) block of wind accelerations"""
+        return self.rng.normal(0, self.sigma, (steps, 3))
+
+    def next(self):
+        """Returns the wind for one step, refilling the block when used up"""
+        if self._index == len(self._block):
+            self._block = self.draw(self.block_size)
+            self._index = 0
+        wind = self._block[self._index]
+        self._index += 1
+        return wind
+
+def run_trials(seed, trial_indices, target=(5.0, 5.0, 10.0), sim_time=10.0,
+               wind_sigma=0.1, kp=2.0, ki=0.1, kd=0.5, dt=0.01, gps=None,
+               wind_field=None):
+    """Runs the given trials as one batch and returns per-trial metrics.
+
+    If gps is a dict of GPS keyword arguments ({} for the defaults), the
+    controller sees held GPS measurements instead of the true state.
+
+    With a wind_field (see windfield.py) the white-noise wind is replaced by
+    turbulence; each trial flies through its own randomly offset region.
+    """
+    trial_indices = np.asarray(trial_indices)
+    n = len(trial_indices)
+    steps = int(sim_time / dt)
+    target = np.asarray(target, dtype=float)
+
+    if wind_field is None:
+        # Pre-draw the whole horizon of wind for every trial, shape (steps, N, 3)
+        wind = np.empty((steps, n, 3))
+        for column, trial in enumerate(trial_indices):
+            wind[:, column] = WindDisturbance(trial_rng(seed, trial), wind_sigma).draw(steps)
+    else:
+        extent = wind_field.shape * wind_field.spacing
+        offsets = np.array([np.random.default_rng([seed, trial, 2]).uniform(0, extent)
+                            for trial in trial_indices])
+
+    drone = BatchDronesim(n, dt=dt)
+    controller = BatchPIDController(n, kp=kp, ki=ki, kd=kd)
+    targets = np.broadcast_to(target, (n, 3))
+    if gps is not None:
+        # A separate stream per trial, so sensor noise does not change the wind
+        sensor = GPS(n, rng=[np.random.default_rng([seed, trial, 1]) for trial in trial_indices], **gps)
+        gps_period = max(1, round(1.0 / (sensor.rate_hz * dt)))
+    energy = np.zeros(n)
+    error_sum = np.zeros(n)
+    max_error = np.zeros(n)
+
+    for step in range(steps):
+        if gps is None:
+            position, velocity = drone.get_positions(), drone.get_velocities()
+        elif step % gps_period == 0:
+            measured = sensor.measure(drone.states)
+            position, velocity = measured[:, :3], measured[:, 3:]
+        controls = controller.control(position, targets, velocity)
+        energy += controls[:, 0] * dt  # Simple energy model
+        if wind_field is None:
+            disturbance = wind[step]
+        else:
+            disturbance = wind_field.disturbance(drone.states, step * dt, offsets)
+        drone.update(controls, disturbance=disturbance)
+
+        error = np.linalg.norm(drone.get_positions() - target, axis=1)
+        error_sum += error
+        np.maximum(max_error, error, out=max_error)
+
+    return {
+        "trial": trial_indices,
+        "final_error": error,
+        "mean_error": error_sum / steps,
+        "max_error": max_error,
+        "energy": energy,
+    }
+
+def run_monte_carlo(n_trials, seed=0, batch_size=1000, failure_error=1.0,
+                    percentiles=(50, 90, 95, 99), **trial_kwargs):
+    """Runs n_trials in batches and returns aggregate statistics"""
+    chunks = []
+    for start in range(0, n_trials, batch_size):
+        indices = np.arange(start, min(start + batch_size, n_trials))
+        chunks.append(run_trials(seed, indices, **trial_kwargs))
+    trials = {key: np.concatenate([c[key] for c in chunks]) for key in chunks[0]}
+
+    failed = ~np.isfinite(trials["final_error"]) | (trials["final_error"] > failure_error)
+    return {
+        "n_trials": n_trials,
+        "seed": seed,
+        "error_percentiles": dict(zip(percentiles, np.percentile(trials["final_error"], percentiles))),
+        "mean_error": float(np.mean(trials["mean_error"])),
+        "energy_mean": float(np.mean(trials["energy"])),
+        "energy_std": float(np.std(trials["energy"])),
+        "energy_percentiles": dict(zip(percentiles, np.percentile(trials["energy"], percentiles))),
+        "failure_rate": float(np.mean(failed)),
+        "trials": trials,
+    }
+
+if __name__ == "__main__":
+    stats = run_monte_carlo(2000, seed=42)
+    print(f"Trials: {stats['n_trials']}  Failure rate: {stats['failure_rate']:.1%}")
+    for p, value in stats["error_percentiles"].items():
+        print(f"Final error p{p}: {value:.3f} meters")
+    print(f"Energy: {stats['energy_mean']:.2f} +/- {stats['energy_std']:.2f} Joules")
@@ -0,0 +1,164 @@
+# running controller comparisons and scenario sweeps on all cores:
+
+# libs:
+import os
+import itertools
+import numpy as np
+
+# building the scenario list:
+def build_scenarios(controllers, targets=(), waypoint_sets=(), seeds=(0,), sim_time=15.0,
+                    termination=None):
+    """Returns one scenario dict per controller x target/waypoints x seed.
+
+    controllers maps a name to (controller_class, kwargs) or
+    (controller_class, kwargs, goals). The class is instantiated inside the
+    worker, so it must be importable there. goals ("target", "waypoints" or
+    both) says which goals the controller can fly; it defaults to the
+    class's goals attribute, else "target" only.
+    termination (see termination.py) lets settled or diverged runs stop early.
+    """
+    goals = [("target", np.asarray(t, dtype=float)) for t in targets]
+    goals += [("waypoints", np.asarray(w, dtype=float)) for w in waypoint_sets]
+
+    scenarios = []
+    for (name, spec), (kind, goal), seed in itertools.product(
+            controllers.items(), goals, seeds):
+        factory, kwargs = spec[:2]
+        accepted = spec[2] if len(spec) > 2 else getattr(factory, "goals", ("target",))
+        if kind not in ((accepted,) if isinstance(accepted, str) else accepted):
+            continue
+        scenarios.append({
+            "id": len(scenarios),
+            "controller": name,
+            "factory": factory,
+            "kwargs": dict(kwargs),
+            kind: goal,
+            "seed": seed,
+            "sim_time": sim_time,
+            "termination": termination,
+        })
+    return scenarios
+
+def _init_worker():
+    # Workers never open a window
+    os.environ["MPLBACKEND"] = "Agg"
+
+def _save_trajectory(trajectory_dir, scenario, positions):
+    path = os.path.join(trajectory_dir, f"scenario_{scenario['id']:06d}.npy")
+    np.save(path, positions)
+    return path
+
+def run_scenario(scenario, trajectory_dir=None, return_positions=False):
+    """Runs one scenario headless and returns its metrics"""
+    from run_simulation import run_simulation
+
+    np.random.seed(scenario["seed"])
+    controller = scenario["factory"](**scenario["kwargs"])
+    result = run_simulation(controller, target=scenario.get("target"),
+                            waypoints=scenario.get("waypoints"),
+                            sim_time=scenario["sim_time"], plot=False,
+                            termination=scenario.get("termination"))
+
+    trajectory = None
+    if trajectory_dir is not None:
+        trajectory = _save_trajectory(trajectory_dir, scenario, result["positions"])
+
+    result_metrics = {
+        "id": scenario["id"],
+        "controller": scenario["controller"],
+        "seed": scenario["seed"],
+        "final_error": result["final_error"],
+        "energy": result["energy"],
+        "settling_time": result["settling_time"],
+        "stop_reason": result["stop_reason"],
+        "trajectory": trajectory,
+    }
+    if return_positions:
+        result_metrics["positions"] = np.array(result["positions"])
+    return result_metrics
+
+def run_sweep(scenarios, max_workers=None, trajectory_dir=None, cache=None):
+    """Yields scenario results as the worker processes finish them.
+
+    With a ResultCache (see result_cache.py), unchanged scenarios are served
+    from disk right away and only the rest are simulated.
+    """
+    # Imported here so the headless core does not pay for multiprocessing
+    from concurrent.futures import ProcessPoolExecutor, as_completed
+
+    if trajectory_dir is not None:
+        os.makedirs(trajectory_dir, exist_ok=True)
+
+    keys = {}
+    if cache is not None:
+        from result_cache import scenario_key
+        pending = []
+        for scenario in scenarios:
+            key = scenario_key(scenario)
+            result = cache.get(key)
+            if result is None:
+                keys[scenario["id"]] = key
+                pending.append(scenario)
+            else:
+                result["id"] = scenario["id"]
+                result["trajectory"] = None
+                if trajectory_dir is not None:
+                    result["trajectory"] = _save_trajectory(trajectory_dir, scenario,
+                                                            result["positions"])
+                yield result
+        scenarios = pending
+    if not scenarios:
+        return
+
+    with ProcessPoolExecutor(max_workers=max_workers, initializer=_init_worker) as pool:
+        futures = {pool.submit(run_scenario, s, trajectory_dir, cache is not None): s
+                   for s in scenarios}
+        for future in as_completed(futures):
+            try:
+                result = future.result()
+            except Exception as exc:
+                # One failing scenario is reported, not allowed to end the sweep
+                yield _error_result(futures[future], exc)
+                continue
+            if cache is not None:
+                cache.put(keys[result["id"]], result)
+            yield result
+
+def _error_result(scenario, exc):
+    return {
+        "id": scenario["id"],
+        "controller": scenario["controller"],
+        "seed": scenario["seed"],
+        "final_error": float("nan"),
+        "energy": float("nan"),
+        "settling_time": None,
+        "stop_reason": "error",
+        "error": f"{type(exc).__name__}: {exc}",
+        "trajectory": None,
+    }
+
+# parallel version of compare_algorithms:
+def compare_algorithms(controllers, target, waypoints=None, seeds=(0,), max_workers=None,
+                       cache=None):
+    scenarios = build_scenarios(controllers, targets=[target],
+                                waypoint_sets=[] if waypoints is None else [waypoints],
+                                seeds=seeds)
+    results = []
+    for result in run_sweep(scenarios, max_workers=max_workers, cache=cache):
+        if "error" in result:
+            print(f"{result['controller']:>10} seed={result['seed']}: failed ({result['error']})")
+            results.append(result)
+            continue
+        settling = result["settling_time"]
+        settling = "-" if settling is None else f"{settling:.2f}s"
+        print(f"{result['controller']:>10} seed={result['seed']}: "
+              f"error={result['final_error']:.3f}m energy={result['energy']:.1f}J "
+              f"settling={settling}")
+        results.append(result)
+    return sorted(results, key=lambda r: r["id"])
+
+if __name__ == "__main__":
+    from sample_code import PIDController
+
+    compare_algorithms({"PID": (PIDController, {})},
+                       target=[5.0, 5.0, 10.0], seeds=range(4))
@@ -0,0 +1,117 @@
+# per-phase timing and opt-in profiling for simulation loops:
+
+# libs:
+import time
+from collections import defaultdict
+
+# class for the loop profiler:
+class Profiler:
+    def __init__(self, enabled=True, cprofile_steps=None, tracemalloc_steps=None):
+        """Times the phases of a simulation loop.
+
+        Call begin_step() at the top of each step and lap(phase) after each
+        phase. cprofile_steps / tracemalloc_steps are (first, last) step
+        ranges to capture with cProfile / tracemalloc. When disabled, lap()
+        and count() do nothing.
+        """
+        self.enabled = enabled
+        self.cprofile_steps = cprofile_steps
+        self.tracemalloc_steps = tracemalloc_steps
+        self.totals = defaultdict(float)
+        self.calls = defaultdict(int)
+        self.counters = defaultdict(int)
+        self.steps = 0
+        self._last = 0.0
+        self._cprofile = None
+        self._cprofile_stats = None
+        self._snapshot = None
+        self._tracing = False
+
+        if not enabled:
+            self.lap = self._noop
+            self.count = self._noop
+            self.begin_step = self._noop
+
+    def _noop(self, *args):
+        pass
+
+    def begin_step(self):
+        self.steps += 1
+        if self.cprofile_steps is not None:
+            self._window_cprofile()
+        if self.tracemalloc_steps is not None:
+            self._window_tracemalloc()
+        self._last = time.perf_counter()
+
+    def lap(self, phase):
+        """Adds the time since the previous lap (or step start) to phase"""
+        now = time.perf_counter()
+        self.totals[phase] += now - self._last
+        self.calls[phase] += 1
+        self._last = now
+
+    def count(self, name, n=1):
+        self.counters[name] += n
+
+    def _window_cprofile(self):
+        first, last = self.cprofile_steps
+        if self.steps == first:
+            import cProfile
+            self._cprofile = cProfile.Profile()
+            self._cprofile.enable()
+        elif self.steps == last + 1 and self._cprofile is not None:
+            self._stop_cprofile()
+
+    def _stop_cprofile(self):
+        self._cprofile.disable()
+        import io
+        import pstats
+        out = io.StringIO()
+        pstats.Stats(self._cprofile, stream=out).sort_stats("cumulative").print_stats(15)
+        self._cprofile_stats = out.getvalue()
+        self._cprofile = None
+
+    def _window_tracemalloc(self):
+        import tracemalloc
+        first, last = self.tracemalloc_steps
+        if self.steps == first:
+            tracemalloc.start()
+            self._tracing = True
+        elif self.steps == last + 1 and self._tracing:
+            self._stop_tracemalloc()
+
+    def _stop_tracemalloc(self):
+        import tracemalloc
+        self._snapshot = tracemalloc.take_snapshot()
+        tracemalloc.stop()
+        self._tracing = False
+
+    def finish(self):
+        """Stops any capture window still open when the loop ends"""
+        if self._cprofile is not None:
+            self._stop_cprofile()
+        if self._tracing:
+            self._stop_tracemalloc()
+
+    def report(self):
+        """Returns the summary as text"""
+        if not self.enabled:
+            return "Profiling disabled"
+        self.finish()
+
+        total = sum(self.totals.values()) or 1.0
+        lines = [f"Profile over {self.steps} steps:"]
+        for phase, seconds in sorted(self.totals.items(), key=lambda item: -item[1]):
+            calls = self.calls[phase]
+            lines.append(f"  {phase:12s} {seconds:9.4f} s {100 * seconds / total:5.1f}% "
+                         f"{calls:9d} calls {1e6 * seconds / calls:9.2f} us/call")
+        for name, value in sorted(self.counters.items()):
+            lines.append(f"  {name:12s} {value:9d}")
+        if self._cprofile_stats:
+            lines.append(f"cProfile for steps {self.cprofile_steps}:")
+            lines.append(self._cprofile_stats)
+        if self._snapshot is not None:
+            lines.append(f"tracemalloc for steps {self.tracemalloc_steps}:")
+            for stat in self._snapshot.statistics("lineno")[:10]:
+                lines.append(f"  {stat}")
+        return "\n".join(lines)
@@ -0,0 +1,83 @@
+# array-backed recorder for trajectory history:
+
+# libs:
+import numpy as np
+
+# class for trajectory recorder:
+class TrajectoryRecorder:
+    def __init__(self, width, capacity=1024, decimation=1, window=None):
+        """Records width-element samples with their times.
+
+        decimation keeps every n-th sample. If window is set the recorder
+        works as a fixed-size ring holding only the latest window samples.
+        """
+        self.width = width
+        self.decimation = max(int(decimation), 1)
+        self.window = window
+        self.calls = 0    # record() calls, including decimated ones
+        self.count = 0    # samples currently held
+
+        if window is None:
+            self._capacity = max(int(capacity), 1)
+        else:
+            # Ring samples are written twice so the latest window is always
+            # one contiguous slice of the buffer
+            self._capacity = int(window)
+        rows = self._capacity if window is None else 2 * self._capacity
+        self._values = np.empty((rows, width))
+        self._times = np.empty(rows)
+        self._head = 0    # next write slot in ring mode
+
+    def _grow(self):
+        self._capacity *= 2
+        values = np.empty((self._capacity, self.width))
+        times = np.empty(self._capacity)
+        values[:self.count] = self._values[:self.count]
+        times[:self.count] = self._times[:self.count]
+        self._values = values
+        self._times = times
+
+    def record(self, t, sample):
+        """Stores one sample, subject to the decimation factor"""
+        self.calls += 1
+        if (self.calls - 1) % self.decimation:
+            return
+
+        if self.window is None:
+            if self.count == self._capacity:
+                self._grow()
+            self._values[self.count] = sample
+            self._times[self.count] = t
+            self.count += 1
+        else:
+            head = self._head
+            self._values[head] = sample
+            self._values[head + self._capacity] = sample
+            self._times[head] = t
+            self._times[head + self._capacity] = t
+            self._head = (head + 1) % self._capacity
+            self.count = min(self.count + 1, self._capacity)
+
+    def _slice(self):
+        if self.window is None:
+            return slice(0, self.count)
+        start = (self._head - self.count) % self._capacity
+        return slice(start, start + self.count)
+
+    @property
+    def values(self):
+        """(count, width) view of the recorded samples, oldest first"""
+        return self._values[self._slice()]
+
+    @property
+    def times(self):
+        """(count,) view of the sample times, oldest first"""
+        return self._times[self._slice()]
+
+    def clear(self):
+        self.calls = 0
+        self.count = 0
+        self._head = 0
+
+    def __len__(self):
+        return self.count
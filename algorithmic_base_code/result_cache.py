@@ -0,0 +1,152 @@
+# disk-backed cache of scenario results, keyed by a hash of the scenario:
+
+# libs:
+import ast
+import hashlib
+import inspect
+import json
+import os
+import numpy as np
+
+# Source files whose changes invalidate every cached result
+CORE_SOURCES = ("base_program.py", "run_simulation.py", "termination.py", "recorder.py")
+_code_versions = {}
+_local_imports = {}
+
+def local_sources(path):
+    """path plus the sibling modules it imports, directly or through other
+    siblings (e.g. sample_code.py -> trajectory.py), as a sorted tuple"""
+    if path not in _local_imports:
+        here = os.path.dirname(path)
+        found, pending = set(), [path]
+        while pending:
+            source = pending.pop()
+            if source in found:
+                continue
+            found.add(source)
+            with open(source, "rb") as f:
+                tree = ast.parse(f.read(), source)
+            for node in ast.walk(tree):
+                if isinstance(node, ast.Import):
+                    names = [alias.name for alias in node.names]
+                elif isinstance(node, ast.ImportFrom) and node.level == 0 and node.module:
+                    names = [node.module]
+                else:
+                    continue
+                for name in names:
+                    candidate = os.path.join(here, name.split(".")[0] + ".py")
+                    if os.path.exists(candidate):
+                        pending.append(candidate)
+        _local_imports[path] = tuple(sorted(found))
+    return _local_imports[path]
+
+def code_version(extra_sources=()):
+    """Hash of the simulator source code (and any extra files, e.g. the controller's)"""
+    here = os.path.dirname(os.path.abspath(__file__))
+    paths = tuple(os.path.join(here, name) for name in CORE_SOURCES) + tuple(extra_sources)
+    if paths not in _code_versions:
+        digest = hashlib.sha256()
+        for path in paths:
+            with open(path, "rb") as f:
+                digest.update(f.read())
+        _code_versions[paths] = digest.hexdigest()[:16]
+    return _code_versions[paths]
+
+def _plain(value):
+    """Converts arrays and NumPy scalars so the scenario can be JSON-hashed"""
+    if isinstance(value, np.ndarray):
+        return value.tolist()
+    if isinstance(value, np.generic):
+        return value.item()
+    if isinstance(value, dict):
+        return {str(k): _plain(v) for k, v in value.items()}
+    if isinstance(value, (list, tuple)):
+        return [_plain(v) for v in value]
+    return value
+
+def scenario_key(scenario):
+    """Content hash of everything that determines a run_scenario result"""
+    from base_program import Dronesim
+
+    drone = Dronesim()
+    factory = scenario["factory"]
+    controller = factory(**scenario["kwargs"])
+    termination = scenario.get("termination")
+
+    definition = {
+        "simulator": {name: getattr(drone, name) for name in ("mass", "g", "dt", "max_thrust", "max_tilt")},
+        "controller": f"{factory.__module__}.{factory.__qualname__}",
+        "kwargs": scenario["kwargs"],
+        "gains": {name: getattr(controller, name) for name in ("kp", "ki", "kd") if hasattr(controller, name)},
+        "target": scenario.get("target"),
+        "waypoints": scenario.get("waypoints"),
+        "seed": scenario["seed"],
+        "sim_time": scenario["sim_time"],
+        "termination": None if termination is None else {
+            name: getattr(termination, name) for name in
+            ("position_tol", "velocity_tol", "hold_time", "divergence_bound", "max_steps")},
+        "code": code_version(local_sources(os.path.abspath(inspect.getsourcefile(factory)))),
+    }
+    text = json.dumps(_plain(definition), sort_keys=True)
+    return hashlib.sha256(text.encode()).hexdigest()
+
+# class for the on-disk cache:
+class ResultCache:
+    def __init__(self, directory, max_bytes=512 * 1024 * 1024):
+        """Stores metrics plus the compressed trajectory per key, evicting the
+        least recently used entries once the directory exceeds max_bytes."""
+        self.directory = directory
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        os.makedirs(directory, exist_ok=True)
+        self.total_bytes = sum(size for _, size, _ in self._entries())  # Kept up to date by put()
+
+    def _path(self, key):
+        return os.path.join(self.directory, key + ".npz")
+
+    def get(self, key):
+        path = self._path(key)
+        try:
+            with np.load(path) as data:
+                result = json.loads(str(data["metrics"]))
+                result["positions"] = data["positions"]
+        except (OSError, KeyError, ValueError):
+            self.misses += 1
+            return None
+        os.utime(path)  # Marks the entry as recently used
+        self.hits += 1
+        result["cached"] = True
+        return result
+
+    def put(self, key, result):
+        # The trajectory path belongs to the run that made it, not to later hits
+        metrics = {k: v for k, v in result.items() if k not in ("positions", "trajectory")}
+        path = self._path(key)
+        tmp = path + ".tmp.npz"
+        np.savez_compressed(tmp, metrics=np.array(json.dumps(_plain(metrics))),
+                            positions=np.asarray(result.get("positions", np.zeros((0, 3)))))
+        replaced = os.path.getsize(path) if os.path.exists(path) else 0
+        os.replace(tmp, path)
+        self.total_bytes += os.path.getsize(path) - replaced
+        if self.total_bytes > self.max_bytes:
+            self.evict()
+
+    def _entries(self):
+        entries = []
+        for name in os.listdir(self.directory):
+            if name.endswith(".npz") and not name.endswith(".tmp.npz"):
+                stat = os.stat(os.path.join(self.directory, name))
+                entries.append((stat.st_mtime, stat.st_size, name))
+        return entries
+
+    def evict(self):
+        """Removes least recently used entries until the cache fits in max_bytes"""
+        entries = self._entries()
+        total = sum(size for _, size, _ in entries)
+        for _, size, name in sorted(entries):
+            if total <= self.max_bytes:
+                break
+            os.remove(os.path.join(self.directory, name))
+            total -= size
+        self.total_bytes = total
@@ -1,21 +1,96 @@
 # running the simulation:
-def run_simulation(controller, target=None, waypoints=None):
+import numpy as np
+from base_program import Dronesim as DroneSimulator, plot_trajectory
+
+def settling_time(times, errors, tolerance=0.1):
+    """Returns the time after which the error stays within tolerance, or None"""
+    outside = np.flatnonzero(errors > tolerance)
+    if len(outside) == 0:
+        return float(times[0]) if len(times) else None
+    if outside[-1] == len(errors) - 1:
+        return None
+    return float(times[outside[-1] + 1])
+
+def run_simulation(controller, target=None, waypoints=None, sim_time=15.0, plot=True,
+                   termination=None, profiler=None, telemetry=None, world=None):
+    """Runs until sim_time, or earlier when termination (see termination.py) says so.
+
+    profiler (see profiling.py) times the controller, integration and
+    logging phases and prints its report at the end. telemetry (a
+    TelemetryWriter, see telemetry.py) streams every step to disk. With a
+    world (see world.py) the result also reports min_clearance,
+    collision_steps and first_collision.
+    """
     drone = DroneSimulator()
-    
+
     # Use waypoints if provided, otherwise use single target
-    sim_time = 15.0
+    final_target = np.asarray(target if target is not None else waypoints[-1], dtype=float)
     steps = int(sim_time / drone.dt)
-    
-    for _ in range(steps):
+    energy_used = 0.0
+    stop_reason = "time_limit"
+    if termination is not None:
+        termination.reset()
+    if world is not None:
+        from world import ClearanceMonitor
+        monitor = ClearanceMonitor(world)
+
+    for step in range(steps):
+        if profiler is not None:
+            profiler.begin_step()
         current_pos = drone.get_position()
         current_vel = drone.get_velocity()
-        
+
         # Pass appropriate target to controller
-        if waypoints is not None:
-            control_input = controller.control(current_pos, None, current_vel)
+        goal = None if waypoints is not None else target
+        if getattr(controller, "needs_time", False):
+            control_input = controller.control(current_pos, goal, current_vel, t=step * drone.dt)
         else:
-            control_input = controller.control(current_pos, target, current_vel)
-        
-        drone.update(control_input)
-    
-    plot_trajectory(drone.position_history, target if target is not None else waypoints[-1])
+            control_input = controller.control(current_pos, goal, current_vel)
+        if profiler is not None:
+            profiler.lap("controller")
+
+        drone.integrate(control_input)
+        if profiler is not None:
+            profiler.lap("integration")
+
+        drone.record((step + 1) * drone.dt)
+        energy_used += control_input[0] * drone.dt  # Simple energy model
+        if telemetry is not None:
+            telemetry.append((step + 1) * drone.dt, drone.state, control_input,
+                             getattr(controller, "error_integral", None))
+        if profiler is not None:
+            profiler.lap("logging")
+
+        if world is not None:
+            monitor.update((step + 1) * drone.dt, drone.state[:3])
+            if profiler is not None:
+                profiler.lap("world")
+
+        if termination is not None:
+            error = np.linalg.norm(drone.state[:3] - final_target)
+            speed = np.linalg.norm(drone.state[3:])
+            if termination.check((step + 1) * drone.dt, error, speed):
+                stop_reason = termination.reason
+                break
+            if profiler is not None:
+                profiler.lap("termination")
+
+    errors = np.linalg.norm(drone.position_history - final_target, axis=1)
+    result = {
+        "final_error": float(errors[-1]),
+        "energy": float(energy_used),
+        "settling_time": (settling_time(drone.time_history, errors) if termination is None
+                          else termination.settling_time),
+        "stop_reason": stop_reason,
+        "steps": drone.steps,
+        "positions": drone.position_history,
+        "times": drone.time_history,
+    }
+    if world is not None:
+        result.update(monitor.summary())
+
+    if profiler is not None and profiler.enabled:
+        print(profiler.report())
+    if plot:
+        plot_trajectory(drone.position_history, final_target)
+    return result
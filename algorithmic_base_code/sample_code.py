@@ -3,9 +3,8 @@
 # libs:
 import numpy as np
 import time
-import matplotlib.pyplot as plt
-from mpl_toolkits.mplot3d import Axes3D
 from abc import ABC, abstractmethod
+from trajectory import MinimumJerkTrajectory
 
 # base controller class for flight controller:
 class BaseController(ABC):
@@ -36,4 +35,36 @@ class PIDController(BaseController):
         pitch = np.arctan2(control[0], control[2]) if thrust > 0 else 0.0
         roll = np.arctan2(control[1], control[2]) if thrust > 0 else 0.0
         return np.array([thrust, roll, pitch])
-    
+
+# algorithm 2
+# class for waypoint following with feed-forward:
+class WaypointController(BaseController):
+    goals = ("waypoints",)  # Flies the route it was built with, not a single target
+    needs_time = True       # Callers pass the simulation time as control(..., t=t)
+
+    def __init__(self, waypoints, speed=2.0, dt=None, mass=1.0, g=9.81):
+        # The route is planned once; control() only looks up the reference
+        self.trajectory = MinimumJerkTrajectory(waypoints, speed=speed)
+        self.kp = 4.0
+        self.kd = 3.0
+        self.dt = dt  # Only for callers that do not pass t: the rate control() is called at
+        self.mass = mass
+        self.g = g
+        self.time = 0.0
+
+    def control(self, current_pos, target_pos, current_vel, t=None):
+        # target_pos is unused (run_simulation passes None with waypoints)
+        if t is None:
+            if self.dt is None:
+                raise ValueError("WaypointController needs the simulation time t, "
+                                 "or the dt it is called at")
+            t = self.time
+            self.time += self.dt
+        ref_pos, ref_vel, ref_acc = self.trajectory.evaluate(t)
+
+        accel = ref_acc + self.kp * (ref_pos - current_pos) + self.kd * (ref_vel - current_vel)
+        accel[2] += self.g
+        thrust = self.mass * np.linalg.norm(accel)
+        pitch = np.arctan2(accel[0], accel[2])
+        roll = np.arctan2(accel[1], accel[2])
+        return np.array([thrust, roll, pitch])
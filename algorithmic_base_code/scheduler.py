@@ -0,0 +1,98 @@
+# multi-rate scheduling of physics, controller, sensors and logging:
+
+# libs:
+import numpy as np
+from base_program import Dronesim
+
+# class for one scheduled component:
+class Task:
+    def __init__(self, name, function, period):
+        self.name = name
+        self.function = function
+        self.period = period  # In base ticks
+        self.calls = 0
+
+# class for the scheduler:
+class MultiRateScheduler:
+    def __init__(self, base_dt):
+        """Runs every task at an integer multiple of the base tick. Outputs are
+        kept in self.held until the task runs again (zero-order hold)."""
+        self.base_dt = base_dt
+        self.tasks = []
+        self.held = {}
+        self.ticks = 0
+
+    def add(self, name, function, rate_hz=None):
+        """Adds function(t) at rate_hz (default: every base tick). Tasks run in
+        the order they were added within a tick."""
+        if rate_hz is None:
+            rate_hz = 1.0 / self.base_dt
+        period = round(1.0 / (rate_hz * self.base_dt))
+        if period < 1 or abs(period * self.base_dt * rate_hz - 1.0) > 1e-6:
+            raise ValueError(f"{name}: {rate_hz} Hz is not an integer divisor of the "
+                             f"base rate {1.0 / self.base_dt:g} Hz")
+        self.tasks.append(Task(name, function, period))
+
+    def tick(self):
+        t = self.ticks * self.base_dt
+        for task in self.tasks:
+            if self.ticks % task.period == 0:
+                output = task.function(t)
+                if isinstance(output, dict):
+                    self.held.update(output)  # One task feeding several held values
+                elif output is not None:
+                    self.held[task.name] = output
+                task.calls += 1
+        self.ticks += 1
+
+    def calls(self):
+        return {task.name: task.calls for task in self.tasks}
+
+def run_scheduled(controller, target=None, waypoints=None, sim_time=15.0, physics_hz=100.0,
+                  controller_hz=50.0, logger_hz=None, sensors=None):
+    """run_simulation with separate rates per component.
+
+    sensors maps a name to (rate_hz, function(t, state)), e.g. GPS().task()
+    from sensors.py. If sensors produce "position" and "velocity" (directly
+    or as keys of a returned dict), the controller uses their held
+    measurements instead of the true state. As in run_simulation, a waypoint
+    controller gets no target and final_error is measured to waypoints[-1].
+    """
+    drone = Dronesim()
+    drone.dt = 1.0 / physics_hz
+    scheduler = MultiRateScheduler(drone.dt)
+    held = scheduler.held
+    energy = [0.0]
+    goal = None if waypoints is not None else target
+    final_target = np.asarray(target if target is not None else waypoints[-1], dtype=float)
+
+    for name, (rate_hz, sensor) in (sensors or {}).items():
+        scheduler.add(name, lambda t, sensor=sensor: sensor(t, drone.state), rate_hz)
+
+    def control(t):
+        position = held.get("position", drone.get_position())
+        velocity = held.get("velocity", drone.get_velocity())
+        if getattr(controller, "needs_time", False):
+            return controller.control(position, goal, velocity, t=t)
+        return controller.control(position, goal, velocity)
+
+    def physics(t):
+        control_input = held["control"]
+        drone.integrate(control_input)
+        energy[0] += control_input[0] * drone.dt  # Simple energy model
+
+    scheduler.add("control", control, controller_hz)
+    scheduler.add("physics", physics)
+    # The logger runs after physics within a tick, so it sees the state at t + dt
+    scheduler.add("logger", lambda t: drone.record(t + drone.dt), logger_hz)
+
+    for _ in range(int(round(sim_time * physics_hz))):
+        scheduler.tick()
+
+    return {
+        "final_error": float(np.linalg.norm(drone.state[:3] - final_target)),
+        "energy": energy[0],
+        "calls": scheduler.calls(),
+        "positions": drone.position_history,
+        "times": drone.time_history,
+    }
@@ -0,0 +1,141 @@
+# noisy sensor models (IMU, GPS, barometer) over batched drone states:
+
+# libs:
+import numpy as np
+from abc import ABC, abstractmethod
+
+# base class for sensors:
+class Sensor(ABC):
+    dim = None
+
+    def __init__(self, n_drones=1, noise_std=0.0, bias_std=0.0, rate_hz=10.0, latency=0.0,
+                 rng=None, block_size=256):
+        """Measurements are truth + per-drone constant bias + white noise,
+        delayed by latency seconds (rounded to whole samples at rate_hz).
+
+        rng is one np.random.Generator for the whole batch, or a list with
+        one per drone so each drone's noise does not depend on the batch.
+        Noise is drawn block_size samples at a time.
+        """
+        self.n_drones = n_drones
+        self.rate_hz = rate_hz
+        self.dt = 1.0 / rate_hz
+        self.noise_std = np.broadcast_to(np.asarray(noise_std, dtype=float), (self.dim,))
+        self.block_size = block_size
+        self.rngs = rng if isinstance(rng, (list, tuple)) else [rng or np.random.default_rng()]
+
+        bias_std = np.broadcast_to(np.asarray(bias_std, dtype=float), (self.dim,))
+        self.bias = self._draw(1)[0] * bias_std
+
+        # Ring-buffered delay line holding the last latency + 1 samples
+        self.delay = int(round(latency * rate_hz))
+        self._line = np.zeros((self.delay + 1, n_drones, self.dim))
+        self._head = 0
+        self._filled = 0
+
+        self._noise = None
+        self._index = block_size
+
+    def _draw(self, rows):
+        """(rows, N, dim) standard normal samples"""
+        if len(self.rngs) == 1:
+            return self.rngs[0].standard_normal((rows, self.n_drones, self.dim))
+        block = np.empty((rows, self.n_drones, self.dim))
+        for i, rng in enumerate(self.rngs):
+            block[:, i] = rng.standard_normal((rows, self.dim))
+        return block
+
+    @abstractmethod
+    def truth(self, states):
+        """(N, dim) true quantity for (N, 6) states"""
+        pass
+
+    def measure(self, states):
+        """Returns the delayed noisy measurement for (N, 6) or (6,) states"""
+        single = np.ndim(states) == 1
+        states = np.atleast_2d(states)
+
+        if self._index == self.block_size:
+            self._noise = self._draw(self.block_size)
+            self._noise *= self.noise_std
+            self._index = 0
+        sample = self._line[self._head]
+        np.add(self.truth(states), self.bias, out=sample)
+        sample += self._noise[self._index]
+        self._index += 1
+
+        self._head = (self._head + 1) % len(self._line)
+        self._filled = min(self._filled + 1, len(self._line))
+        out = self._line[(self._head - self._filled) % len(self._line)].copy()
+        return out[0] if single else out
+
+# class for GPS (position and velocity):
+class GPS(Sensor):
+    dim = 6
+
+    def __init__(self, n_drones=1, noise_std=(1.0, 1.0, 2.0, 0.1, 0.1, 0.2),
+                 bias_std=(0.5, 0.5, 1.0, 0.0, 0.0, 0.0), rate_hz=10.0, latency=0.1, **kwargs):
+        super().__init__(n_drones, noise_std, bias_std, rate_hz, latency, **kwargs)
+
+    def truth(self, states):
+        return states[:, :6]
+
+    def task(self):
+        """(rate_hz, function) for run_scheduled; feeds the controller's position and velocity"""
+        def read(t, state):
+            m = self.measure(state)
+            return {"position": m[..., :3], "velocity": m[..., 3:]}
+        return self.rate_hz, read
+
+# class for barometric altitude:
+class Barometer(Sensor):
+    dim = 1
+
+    def __init__(self, n_drones=1, noise_std=0.3, bias_std=1.0, rate_hz=50.0, latency=0.0,
+                 **kwargs):
+        super().__init__(n_drones, noise_std, bias_std, rate_hz, latency, **kwargs)
+
+    def truth(self, states):
+        return states[:, 2:3]
+
+    def task(self):
+        return self.rate_hz, lambda t, state: {"altitude": self.measure(state)[..., 0]}
+
+# class for the accelerometer part of an IMU:
+class IMU(Sensor):
+    dim = 3
+
+    def __init__(self, n_drones=1, noise_std=0.05, bias_std=0.02, rate_hz=100.0, latency=0.0,
+                 g=9.81, **kwargs):
+        super().__init__(n_drones, noise_std, bias_std, rate_hz, latency, **kwargs)
+        self.g = g
+        self._previous_velocity = None
+
+    def truth(self, states):
+        """Specific force from the velocity change since the last sample"""
+        velocity = states[:, 3:6]
+        if self._previous_velocity is None:
+            accel = np.zeros_like(velocity)
+        else:
+            accel = (velocity - self._previous_velocity) / self.dt
+        self._previous_velocity = velocity.copy()
+        accel[:, 2] += self.g
+        return accel
+
+    def task(self):
+        return self.rate_hz, lambda t, state: {"acceleration": self.measure(state)}
+
+# class for a downward rangefinder (altitude above ground level):
+class AGLSensor(Sensor):
+    dim = 1
+
+    def __init__(self, terrain, n_drones=1, noise_std=0.05, bias_std=0.0, rate_hz=50.0,
+                 latency=0.0, **kwargs):
+        super().__init__(n_drones, noise_std, bias_std, rate_hz, latency, **kwargs)
+        self.terrain = terrain
+
+    def truth(self, states):
+        return self.terrain.altitude_above_ground(states)[:, None]
+
+    def task(self):
+        return self.rate_hz, lambda t, state: {"agl": self.measure(state)[..., 0]}
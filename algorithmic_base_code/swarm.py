@@ -0,0 +1,150 @@
+# multi-drone swarm simulation with a spatial-hash neighbor index:
+
+# libs:
+import numpy as np
+from batch_sim import BatchDronesim
+from batch_controller import BatchPIDController
+
+# Neighbor cell offsets: all 27, and the "half shell" (own cell plus the 13
+# lexicographically positive neighbors) that finds every pair exactly once
+_OFFSETS = np.array([(dx, dy, dz) for dx in (-1, 0, 1) for dy in (-1, 0, 1) for dz in (-1, 0, 1)])
+_HALF_SHELL = np.array([o for o in _OFFSETS if tuple(o) >= (0, 0, 0)])
+
+# class for the uniform-grid spatial hash:
+class SpatialHash:
+    def __init__(self, cell_size):
+        """Buckets points into cubic cells of cell_size, rebuilt by sorting
+        cell keys; radius queries up to cell_size only visit adjacent cells."""
+        self.cell_size = float(cell_size)
+        self.positions = np.zeros((0, 3))
+
+    def build(self, positions):
+        self.positions = np.asarray(positions, dtype=float)
+        cells = np.floor(self.positions / self.cell_size).astype(np.int64)
+
+        # Dense keys over the occupied bounding box, padded by one cell so
+        # neighbor offsets never wrap around into another row
+        self._low = cells.min(axis=0) - 1 if len(cells) else np.zeros(3, dtype=np.int64)
+        self._shape = (cells.max(axis=0) + 2 - self._low) if len(cells) else np.ones(3, dtype=np.int64)
+        self._cells = cells
+        keys = self._key(cells)
+
+        self.order = np.argsort(keys, kind="stable")  # Point indices grouped by cell
+        self.sorted_keys = keys[self.order]
+        return self
+
+    def _key(self, cells):
+        c = cells - self._low
+        return (c[..., 0] * self._shape[1] + c[..., 1]) * self._shape[2] + c[..., 2]
+
+    def _candidates(self, offsets):
+        """(i, j) index pairs of points in cells offset from each other"""
+        firsts, seconds = [], []
+        for offset in offsets:
+            keys = self._key(self._cells + offset)
+            start = np.searchsorted(self.sorted_keys, keys, side="left")
+            end = np.searchsorted(self.sorted_keys, keys, side="right")
+            counts = end - start
+            total = int(counts.sum())
+            if total == 0:
+                continue
+            first = np.repeat(np.arange(len(keys)), counts)
+            # Position of every candidate within its cell's run of sorted points
+            run = np.arange(total) - np.repeat(np.cumsum(counts) - counts, counts)
+            second = self.order[np.repeat(start, counts) + run]
+            if not offset.any():
+                keep = first < second  # Same cell: each pair once, no self pairs
+                first, second = first[keep], second[keep]
+            firsts.append(first)
+            seconds.append(second)
+        if not firsts:
+            return np.zeros(0, dtype=np.int64), np.zeros(0, dtype=np.int64)
+        return np.concatenate(firsts), np.concatenate(seconds)
+
+    def pairs(self, radius):
+        """(i, j, distance) for every pair closer than radius (<= cell_size)"""
+        if radius > self.cell_size:
+            raise ValueError(f"radius {radius} exceeds the cell size {self.cell_size}")
+        first, second = self._candidates(_HALF_SHELL)
+        distance = np.linalg.norm(self.positions[first] - self.positions[second], axis=1)
+        close = distance < radius
+        return first[close], second[close], distance[close]
+
+    def neighbors(self, index, radius):
+        """Indices of the points within radius of point index"""
+        if radius > self.cell_size:
+            raise ValueError(f"radius {radius} exceeds the cell size {self.cell_size}")
+        keys = self._key(self._cells[index] + _OFFSETS)
+        start = np.searchsorted(self.sorted_keys, keys, side="left")
+        end = np.searchsorted(self.sorted_keys, keys, side="right")
+        candidates = np.concatenate([self.order[s:e] for s, e in zip(start, end)])
+        candidates = candidates[candidates != index]
+        distance = np.linalg.norm(self.positions[candidates] - self.positions[index], axis=1)
+        return candidates[distance < radius]
+
+# class for the swarm:
+class Swarm:
+    def __init__(self, n_drones, initial_states=None, separation=2.0, near_miss=0.5,
+                 repulsion=1.0, dt=0.01, controller=None):
+        """BatchDronesim plus separation keeping and near-miss detection.
+
+        Drones closer than separation push their position targets apart
+        (weighted by how far inside the radius they are); pairs closer than
+        near_miss are counted as near misses.
+        """
+        self.drone = BatchDronesim(n_drones, dt=dt, initial_states=initial_states)
+        self.controller = controller or BatchPIDController(n_drones)
+        self.index = SpatialHash(separation)
+        self.separation = separation
+        self.near_miss = near_miss
+        self.repulsion = repulsion
+
+        self.near_misses = 0
+        self.min_separation = np.inf
+        self._offsets = np.zeros((n_drones, 3))
+
+    def step(self, targets):
+        positions = self.drone.get_positions()
+        first, second, distance = self.index.build(positions).pairs(self.separation)
+
+        # Separation: push both drones of each close pair apart
+        self._offsets[:] = 0.0
+        if len(first):
+            away = positions[first] - positions[second]
+            weight = self.repulsion * (self.separation - distance) / np.maximum(distance, 1e-9)
+            push = away * weight[:, None]
+            np.add.at(self._offsets, first, push)
+            np.subtract.at(self._offsets, second, push)
+
+            self.near_misses += int(np.count_nonzero(distance < self.near_miss))
+            # Only pairs inside the separation radius are seen; inf means none were
+            self.min_separation = min(self.min_separation, float(distance.min()))
+
+        controls = self.controller.control(positions, targets + self._offsets,
+                                           self.drone.get_velocities())
+        self.drone.update(controls)
+        return first, second
+
+def grid_states(n_drones, spacing=3.0, altitude=0.0):
+    """(N, 6) initial states on a square grid, at rest"""
+    side = int(np.ceil(np.sqrt(n_drones)))
+    index = np.arange(n_drones)
+    states = np.zeros((n_drones, 6))
+    states[:, 0] = (index % side) * spacing
+    states[:, 1] = (index // side) * spacing
+    states[:, 2] = altitude
+    return states
+
+if __name__ == "__main__":
+    import time
+    n = 2000
+    states = grid_states(n, spacing=2.5)
+    swarm = Swarm(n, initial_states=states)
+    # Formation transit: every drone keeps its slot in the grid
+    targets = states[:, :3] + np.array([20.0, 20.0, 10.0])
+    start = time.perf_counter()
+    for _ in range(200):
+        swarm.step(targets)
+    elapsed = time.perf_counter() - start
+    print(f"{n} drones, 200 steps in {elapsed:.2f} s")
+    print(f"Near misses: {swarm.near_misses}  Minimum separation: {swarm.min_separation:.3f} m")
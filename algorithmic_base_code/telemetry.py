@@ -0,0 +1,124 @@
+# binary telemetry log with memory-mapped replay:
+#
+# File layout: a fixed-size header (magic + JSON description) followed by
+# fixed-width records (time, state, control, extras) written in chunks.
+
+# libs:
+import json
+import os
+import numpy as np
+
+MAGIC = b"DRTL0001"
+HEADER_SIZE = 512
+
+def record_dtype(n_extra=0):
+    """Record layout; extras hold controller internals such as the PID integral"""
+    fields = [("time", "<f8"), ("state", "<f8", (6,)), ("control", "<f8", (3,))]
+    if n_extra:
+        fields.append(("extras", "<f8", (n_extra,)))
+    return np.dtype(fields)
+
+# class for the streaming writer:
+class TelemetryWriter:
+    def __init__(self, path, n_extra=0, chunk_records=4096, metadata=None):
+        self.path = path
+        self.dtype = record_dtype(n_extra)
+        self.n_extra = n_extra
+        self.count = 0
+
+        # Records are collected in a preallocated chunk and written in bulk
+        self._chunk = np.zeros(chunk_records, dtype=self.dtype)
+        self._fill = 0
+
+        header = json.dumps({"n_extra": n_extra, "metadata": metadata or {}}).encode()
+        if len(header) > HEADER_SIZE - len(MAGIC):
+            raise ValueError("telemetry metadata does not fit in the header")
+        self._file = open(path, "wb")
+        self._file.write(MAGIC + header.ljust(HEADER_SIZE - len(MAGIC), b" "))
+
+    def append(self, t, state, control, extras=None):
+        record = self._chunk[self._fill]
+        record["time"] = t
+        record["state"] = state
+        record["control"] = control
+        if self.n_extra:
+            record["extras"] = extras
+        self._fill += 1
+        self.count += 1
+        if self._fill == len(self._chunk):
+            self.flush()
+
+    def flush(self):
+        if self._fill:
+            self._chunk[:self._fill].tofile(self._file)
+            self._fill = 0
+        self._file.flush()
+
+    def close(self):
+        if not self._file.closed:
+            self.flush()
+            self._file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+# class for the memory-mapped reader:
+class TelemetryReader:
+    def __init__(self, path):
+        with open(path, "rb") as f:
+            raw = f.read(HEADER_SIZE)
+        if raw[:len(MAGIC)] != MAGIC:
+            raise ValueError(f"{path} is not a telemetry log")
+        header = json.loads(raw[len(MAGIC):].decode())
+        self.metadata = header["metadata"]
+        self.dtype = record_dtype(header["n_extra"])
+
+        count = (os.path.getsize(path) - HEADER_SIZE) // self.dtype.itemsize
+        if count:
+            self.records = np.memmap(path, dtype=self.dtype, mode="r",
+                                     offset=HEADER_SIZE, shape=(count,))
+        else:
+            self.records = np.zeros(0, dtype=self.dtype)
+
+    def __len__(self):
+        return len(self.records)
+
+    def between(self, t_start=-np.inf, t_end=np.inf):
+        """Zero-copy view of the records with t_start <= time <= t_end"""
+        times = self.records["time"]
+        first = np.searchsorted(times, t_start, side="left")
+        last = np.searchsorted(times, t_end, side="right")
+        return self.records[first:last]
+
+    def frames(self, dt, t_start=None, t_end=None):
+        """Yields the latest record at every dt of log time, for replay"""
+        times = self.records["time"]
+        if len(times) == 0:
+            return
+        t = times[0] if t_start is None else t_start
+        t_end = times[-1] if t_end is None else t_end
+        while t <= t_end:
+            index = max(np.searchsorted(times, t, side="right") - 1, 0)
+            yield self.records[index]
+            t += dt
+
+# replaying logs from disk:
+def replay_plot(path, target, t_start=-np.inf, t_end=np.inf):
+    """Feeds a logged time range to plot_trajectory"""
+    from base_program import plot_trajectory
+    records = TelemetryReader(path).between(t_start, t_end)
+    plot_trajectory(records["state"][:, :3], np.asarray(target))
+
+def replay(path, draw, fps=60.0, speed=1.0, realtime=True):
+    """Calls draw(record) once per frame, e.g. to drive a pygame renderer"""
+    import time
+    frame_dt = 1.0 / fps
+    for record in TelemetryReader(path).frames(frame_dt * speed):
+        start = time.perf_counter()
+        if draw(record) is False:
+            break
+        if realtime:
+            time.sleep(max(0.0, frame_dt - (time.perf_counter() - start)))
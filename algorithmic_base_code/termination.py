@@ -0,0 +1,46 @@
+# stopping a run early once it has settled or diverged:
+
+# libs:
+import numpy as np
+
+# class for termination criteria:
+class Termination:
+    def __init__(self, position_tol=0.1, velocity_tol=0.1, hold_time=1.0,
+                 divergence_bound=1000.0, max_steps=None):
+        """A run is settled once it stays within position_tol of the target
+        and below velocity_tol for hold_time seconds. It has diverged when the
+        error exceeds divergence_bound (or stops being finite)."""
+        self.position_tol = position_tol
+        self.velocity_tol = velocity_tol
+        self.hold_time = hold_time
+        self.divergence_bound = divergence_bound
+        self.max_steps = max_steps
+        self.reset()
+
+    def reset(self):
+        self.steps = 0
+        self.settle_start = None
+        self.reason = None
+
+    @property
+    def settling_time(self):
+        """Time the drone entered the tolerance band for good, if it settled"""
+        return self.settle_start if self.reason == "settled" else None
+
+    def check(self, t, error, speed):
+        """Returns the stop reason for this step, or None to keep going"""
+        self.steps += 1
+
+        if not np.isfinite(error) or error > self.divergence_bound:
+            self.reason = "diverged"
+        elif error <= self.position_tol and speed <= self.velocity_tol:
+            if self.settle_start is None:
+                self.settle_start = t
+            if t - self.settle_start >= self.hold_time:
+                self.reason = "settled"
+        else:
+            self.settle_start = None
+
+        if self.reason is None and self.max_steps is not None and self.steps >= self.max_steps:
+            self.reason = "step_budget"
+        return self.reason
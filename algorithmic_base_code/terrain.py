@@ -0,0 +1,124 @@
+# memory-mapped terrain heightmap with a tiled LRU cache:
+#
+# File layout: a fixed-size header (magic + JSON description) followed by a
+# row-major float32 raster. Row r, column c is the elevation at
+# x = origin[0] + c * spacing, y = origin[1] + r * spacing.
+
+# libs:
+import json
+from collections import OrderedDict
+import numpy as np
+
+MAGIC = b"DRHM0001"
+HEADER_SIZE = 512
+
+def create_heightmap(path, rows, cols, spacing=1.0, origin=(0.0, 0.0)):
+    """Creates an empty heightmap file and returns a writable memmap of it, so
+    rasters larger than RAM can be filled block by block"""
+    header = json.dumps({"rows": rows, "cols": cols, "spacing": spacing,
+                         "origin": list(origin)}).encode()
+    with open(path, "wb") as f:
+        f.write(MAGIC + header.ljust(HEADER_SIZE - len(MAGIC), b" "))
+    return np.memmap(path, dtype="<f4", mode="r+", offset=HEADER_SIZE, shape=(rows, cols))
+
+def write_heightmap(path, heights, spacing=1.0, origin=(0.0, 0.0)):
+    heights = np.asarray(heights)
+    raster = create_heightmap(path, heights.shape[0], heights.shape[1], spacing, origin)
+    raster[:] = heights
+    raster.flush()
+
+# class for the terrain:
+class Terrain:
+    def __init__(self, path, tile_size=256, max_tiles=64):
+        """Elevation lookups read tile_size x tile_size tiles from the memory-
+        mapped raster and keep the max_tiles most recently used in memory."""
+        with open(path, "rb") as f:
+            raw = f.read(HEADER_SIZE)
+        if raw[:len(MAGIC)] != MAGIC:
+            raise ValueError(f"{path} is not a heightmap")
+        header = json.loads(raw[len(MAGIC):].decode())
+        self.rows, self.cols = header["rows"], header["cols"]
+        self.spacing = header["spacing"]
+        self.origin = np.asarray(header["origin"], dtype=float)
+        self.raster = np.memmap(path, dtype="<f4", mode="r", offset=HEADER_SIZE,
+                                shape=(self.rows, self.cols))
+
+        self.tile_size = tile_size
+        self.max_tiles = max_tiles
+        self._tiles = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    def tile(self, tile_row, tile_col):
+        """Tile with one sample of overlap on the far edges, so every grid
+        cell (and its four corners) lies inside a single tile"""
+        key = (tile_row, tile_col)
+        tile = self._tiles.get(key)
+        if tile is not None:
+            self._tiles.move_to_end(key)
+            self.hits += 1
+            return tile
+        self.misses += 1
+        r0, c0 = tile_row * self.tile_size, tile_col * self.tile_size
+        tile = np.array(self.raster[r0:r0 + self.tile_size + 1, c0:c0 + self.tile_size + 1],
+                        dtype=float)
+        self._tiles[key] = tile
+        if len(self._tiles) > self.max_tiles:
+            self._tiles.popitem(last=False)
+        return tile
+
+    def _lookup(self, xy, normals):
+        xy = np.asarray(xy, dtype=float)
+        single = xy.ndim == 1
+        xy = np.atleast_2d(xy)[:, :2]
+
+        # Fractional grid coordinates, clamped to the raster
+        grid = (xy - self.origin) / self.spacing
+        col = np.clip(grid[:, 0], 0.0, self.cols - 1)
+        row = np.clip(grid[:, 1], 0.0, self.rows - 1)
+        c = np.minimum(col.astype(np.int64), max(self.cols - 2, 0))
+        r = np.minimum(row.astype(np.int64), max(self.rows - 2, 0))
+        fx, fy = col - c, row - r
+
+        z00, z01, z10, z11 = (np.empty(len(xy)) for _ in range(4))
+        # Points grouped by tile with one sort, so each tile is visited once
+        tile_cols_total = (self.cols + self.tile_size - 1) // self.tile_size
+        keys = (r // self.tile_size) * tile_cols_total + c // self.tile_size
+        order = np.argsort(keys, kind="stable")
+        bounds = np.flatnonzero(np.diff(keys[order])) + 1
+        for points in np.split(order, bounds):
+            tile_row, tile_col = divmod(int(keys[points[0]]), tile_cols_total)
+            tile = self.tile(tile_row, tile_col)
+            lr = r[points] - tile_row * self.tile_size
+            lc = c[points] - tile_col * self.tile_size
+            lr1 = np.minimum(lr + 1, tile.shape[0] - 1)
+            lc1 = np.minimum(lc + 1, tile.shape[1] - 1)
+            z00[points], z01[points] = tile[lr, lc], tile[lr, lc1]
+            z10[points], z11[points] = tile[lr1, lc], tile[lr1, lc1]
+
+        elevation = (z00 * (1 - fx) * (1 - fy) + z01 * fx * (1 - fy)
+                     + z10 * (1 - fx) * fy + z11 * fx * fy)
+        if not normals:
+            return elevation[0] if single else elevation
+
+        # Gradient of the bilinear patch
+        dz_dx = ((z01 - z00) * (1 - fy) + (z11 - z10) * fy) / self.spacing
+        dz_dy = ((z10 - z00) * (1 - fx) + (z11 - z01) * fx) / self.spacing
+        normal = np.stack([-dz_dx, -dz_dy, np.ones_like(dz_dx)], axis=1)
+        normal /= np.linalg.norm(normal, axis=1)[:, None]
+        if single:
+            return elevation[0], normal[0]
+        return elevation, normal
+
+    def elevation(self, xy):
+        """Bilinear elevation at (N, 2+) or (2+,) positions; outside the raster
+        the nearest edge value is used"""
+        return self._lookup(xy, normals=False)
+
+    def elevation_and_normal(self, xy):
+        """(elevation, unit surface normal) at (N, 2+) or (2+,) positions"""
+        return self._lookup(xy, normals=True)
+
+    def altitude_above_ground(self, states):
+        states = np.asarray(states, dtype=float)
+        return states[..., 2] - self.elevation(states[..., :2])
@@ -1,7 +1,5 @@
 import numpy as np
-import matplotlib.pyplot as plt
 import time
-from mpl_toolkits.mplot3d import Axes3D
 from abc import ABC, abstractmethod
 
 # base controller class:
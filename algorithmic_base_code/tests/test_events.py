@@ -0,0 +1,30 @@
+# event location inside adaptive steps:
+import numpy as np
+from integrators import DormandPrince45, DenseSolution
+from events import Event
+
+def falling(t, y):
+    return np.array([y[1], -9.81])
+
+def test_terminal_event_time_and_dense_output():
+    touchdown = Event(lambda t, s: s[0], direction=-1, terminal=True, name="ground")
+    integrator = DormandPrince45()
+    solution = DenseSolution()
+    y = integrator.integrate(falling, 0.0, [10.0, 0.0], 5.0, solution, [touchdown])
+
+    expected = np.sqrt(2 * 10.0 / 9.81)
+    assert abs(integrator.t - expected) < 1e-8
+    assert abs(y[0]) < 1e-8
+    assert solution.events[0][0] == "ground"
+    # Dense output ends at the event, never below the ground
+    assert solution(np.linspace(0.0, 5.0, 501))[:, 0].min() > -1e-8
+
+def test_event_direction():
+    # Falling through 5 m is a downward crossing, which an upward event ignores
+    up = Event(lambda t, s: s[0] - 5.0, direction=1)
+    integrator = DormandPrince45()
+    integrator.integrate(falling, 0.0, [10.0, 0.0], 1.0, events=[up])
+    assert integrator.hits == []
+    down = Event(lambda t, s: s[0] - 5.0, direction=-1)
+    integrator.integrate(falling, 0.0, [10.0, 0.0], 1.5, events=[down])
+    assert abs(integrator.hits[0][1] - np.sqrt(2 * 5.0 / 9.81)) < 1e-8
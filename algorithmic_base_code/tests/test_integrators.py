@@ -0,0 +1,37 @@
+# Dormand-Prince integrator and dense output:
+import numpy as np
+from integrators import DormandPrince45, DenseSolution, simulate_adaptive
+from base_program import Dronesim
+
+def oscillator(t, y):
+    return np.array([y[1], -y[0]])
+
+def falling(t, y):
+    return np.array([y[1], -9.81])
+
+def test_accuracy_and_dense_output():
+    integrator = DormandPrince45(rtol=1e-8, atol=1e-10)
+    solution = DenseSolution()
+    y = integrator.integrate(oscillator, 0.0, [0.0, 1.0], 10.0, solution)
+    assert np.allclose(y, [np.sin(10.0), np.cos(10.0)], atol=1e-7)
+
+    times = np.linspace(0.0, 10.0, 1001)
+    assert np.allclose(solution(times)[:, 0], np.sin(times), atol=1e-6)
+    assert integrator.accepted < 200
+
+def test_step_is_exact_for_polynomials():
+    # Free fall is quadratic in t, which a 5th-order step integrates exactly
+    y = DormandPrince45().integrate(falling, 0.0, [10.0, 0.0], 1.0)
+    assert np.allclose(y, [10.0 - 9.81 / 2, -9.81], atol=1e-12)
+
+def test_simulate_adaptive_matches_fixed_step():
+    class Hover:
+        def control(self, current_pos, target_pos, current_vel):
+            return np.array([12.0, 0.05, -0.1])
+
+    adaptive = Dronesim()
+    simulate_adaptive(adaptive, Hover(), None, sim_time=2.0, control_dt=0.1)
+    fixed = Dronesim()
+    for _ in range(200):
+        fixed.integrate(np.array([12.0, 0.05, -0.1]))
+    assert np.allclose(adaptive.state, fixed.state, atol=1e-6)
@@ -0,0 +1,35 @@
+# trajectory recorder growth, decimation and ring mode:
+import numpy as np
+from recorder import TrajectoryRecorder
+
+def test_growth_keeps_every_sample():
+    recorder = TrajectoryRecorder(3, capacity=2)
+    for i in range(10):
+        recorder.record(i * 0.1, [i, i, i])
+    assert len(recorder) == 10
+    assert np.array_equal(recorder.values[:, 0], np.arange(10))
+    assert np.allclose(recorder.times, np.arange(10) * 0.1)
+
+def test_decimation():
+    recorder = TrajectoryRecorder(1, decimation=3)
+    for i in range(10):
+        recorder.record(i, [i])
+    assert np.array_equal(recorder.values[:, 0], [0, 3, 6, 9])
+
+def test_ring_holds_latest_window_in_order():
+    recorder = TrajectoryRecorder(2, window=4)
+    for i in range(11):
+        recorder.record(i, [i, -i])
+        expected = np.arange(max(0, i - 3), i + 1)
+        assert np.array_equal(recorder.values[:, 0], expected)
+        assert np.array_equal(recorder.times, expected)
+        assert recorder.values.flags["C_CONTIGUOUS"]
+
+def test_clear():
+    recorder = TrajectoryRecorder(1, window=3)
+    for i in range(5):
+        recorder.record(i, [i])
+    recorder.clear()
+    assert len(recorder) == 0
+    recorder.record(7, [7])
+    assert np.array_equal(recorder.values[:, 0], [7])
@@ -0,0 +1,40 @@
+# spatial hash against brute-force pair search:
+import numpy as np
+import pytest
+from swarm import SpatialHash
+
+def brute_force_pairs(positions, radius):
+    distance = np.linalg.norm(positions[:, None] - positions[None], axis=2)
+    i, j = np.nonzero(np.triu(distance < radius, 1))
+    return set(zip(i.tolist(), j.tolist()))
+
+@pytest.mark.parametrize("n, spread", [(0, 1.0), (1, 1.0), (2, 0.5), (300, 10.0), (500, 3.0)])
+def test_pairs_match_brute_force(n, spread):
+    rng = np.random.default_rng(n)
+    positions = rng.uniform(-spread, spread, (n, 3))
+    first, second, distance = SpatialHash(1.5).build(positions).pairs(1.2)
+
+    found = set(zip(np.minimum(first, second).tolist(), np.maximum(first, second).tolist()))
+    assert len(found) == len(first)  # Every pair exactly once
+    assert found == brute_force_pairs(positions, 1.2)
+    assert np.allclose(distance, np.linalg.norm(positions[first] - positions[second], axis=1))
+
+def test_pairs_on_cell_boundaries():
+    # Points exactly on cell edges and at negative coordinates
+    positions = np.array([[0.0, 0, 0], [0.999, 0, 0], [-0.999, 0, 0], [0, 0, -0.999],
+                          [1.0, 1.0, 1.0], [1.0, 1.0, 0.001], [-1e-12, 0.5, 0.5]])
+    first, second, _ = SpatialHash(1.0).build(positions).pairs(1.0)
+    found = set(zip(np.minimum(first, second).tolist(), np.maximum(first, second).tolist()))
+    assert found == brute_force_pairs(positions, 1.0)
+
+def test_neighbors_match_brute_force():
+    positions = np.random.default_rng(1).uniform(-5, 5, (400, 3))
+    index = SpatialHash(2.0).build(positions)
+    distance = np.linalg.norm(positions - positions[7], axis=1)
+    expected = set(np.flatnonzero(distance < 1.5).tolist()) - {7}
+    assert set(index.neighbors(7, 1.5).tolist()) == expected
+
+def test_radius_larger_than_cell_is_rejected():
+    index = SpatialHash(1.0).build(np.zeros((2, 3)))
+    with pytest.raises(ValueError):
+        index.pairs(2.0)
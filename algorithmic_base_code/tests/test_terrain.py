@@ -0,0 +1,55 @@
+# tiled terrain lookups against bilinear interpolation on the full raster:
+import numpy as np
+import pytest
+from terrain import Terrain, write_heightmap
+
+SPACING, ORIGIN = 2.0, (-5.0, 3.0)
+
+def direct(heights, xy):
+    """Bilinear elevation and normal computed on the whole array"""
+    rows, cols = heights.shape
+    col = np.clip((xy[:, 0] - ORIGIN[0]) / SPACING, 0, cols - 1)
+    row = np.clip((xy[:, 1] - ORIGIN[1]) / SPACING, 0, rows - 1)
+    c = np.minimum(col.astype(int), cols - 2)
+    r = np.minimum(row.astype(int), rows - 2)
+    fx, fy = col - c, row - r
+    z00, z01 = heights[r, c], heights[r, c + 1]
+    z10, z11 = heights[r + 1, c], heights[r + 1, c + 1]
+    elevation = z00 * (1 - fx) * (1 - fy) + z01 * fx * (1 - fy) + z10 * (1 - fx) * fy + z11 * fx * fy
+    dz_dx = ((z01 - z00) * (1 - fy) + (z11 - z10) * fy) / SPACING
+    dz_dy = ((z10 - z00) * (1 - fx) + (z11 - z01) * fx) / SPACING
+    normal = np.stack([-dz_dx, -dz_dy, np.ones_like(dz_dx)], axis=1)
+    return elevation, normal / np.linalg.norm(normal, axis=1)[:, None]
+
+@pytest.fixture
+def terrain(tmp_path):
+    rng = np.random.default_rng(0)
+    heights = rng.uniform(0, 50, (37, 53)).astype(np.float32)  # Not a multiple of the tile size
+    path = tmp_path / "terrain.bin"
+    write_heightmap(path, heights, SPACING, ORIGIN)
+    return Terrain(path, tile_size=8, max_tiles=3), heights.astype(float)
+
+def test_lookup_matches_full_raster_across_seams_and_edges(terrain):
+    terrain, heights = terrain
+    rows, cols = heights.shape
+    rng = np.random.default_rng(1)
+
+    # Random points (some outside the raster), points on tile seams and on the far edges
+    seams = np.arange(0, max(rows, cols), 8) * SPACING
+    xy = np.concatenate([
+        np.c_[rng.uniform(-20, cols * SPACING + 10, 2000), rng.uniform(-20, rows * SPACING + 10, 2000)],
+        np.stack(np.meshgrid(seams, seams), axis=-1).reshape(-1, 2),
+        np.stack(np.meshgrid(seams + 0.5, seams - 0.25), axis=-1).reshape(-1, 2),
+        [[(cols - 1) * SPACING, (rows - 1) * SPACING], [(cols - 1) * SPACING, 0.0], [0.0, (rows - 1) * SPACING]],
+    ]) + ORIGIN
+
+    expected_elevation, expected_normal = direct(heights, xy)
+    elevation, normal = terrain.elevation_and_normal(xy)
+    assert np.allclose(elevation, expected_elevation)
+    assert np.allclose(normal, expected_normal)
+    assert np.allclose(terrain.elevation(xy), expected_elevation)
+
+    # Single positions go through the same path
+    e, n = terrain.elevation_and_normal(xy[5])
+    assert np.isclose(e, expected_elevation[5]) and np.allclose(n, expected_normal[5])
+    assert terrain.misses > 3  # The LRU cache evicted and reloaded tiles
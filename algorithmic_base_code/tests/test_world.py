@@ -0,0 +1,66 @@
+# world clearance and collision queries against brute force:
+import numpy as np
+import pytest
+from world import World, load_world
+
+def random_world(rng, n=300, extent=200.0):
+    obstacles = []
+    for _ in range(n):
+        x, y = rng.uniform(0, extent, 2)
+        kind = rng.integers(3)
+        if kind == 0:
+            obstacles.append({"type": "box", "min": [x, y, 0.0],
+                              "max": [x + rng.uniform(1, 15), y + rng.uniform(1, 15), rng.uniform(5, 50)]})
+        elif kind == 1:
+            obstacles.append({"type": "cylinder", "center": [x, y], "radius": rng.uniform(1, 6),
+                              "z": [0.0, rng.uniform(5, 50)]})
+        else:
+            angles = np.sort(rng.uniform(0, 2 * np.pi, 5))
+            radius = rng.uniform(2, 10)
+            vertices = np.c_[x + radius * np.cos(angles), y + radius * np.sin(angles)]
+            obstacles.append({"type": "polygon", "vertices": vertices.tolist(), "z": [10.0, None]})
+    return World(obstacles, cell_size=12.0)
+
+def brute_force_distance(world, positions):
+    n, m = len(positions), len(world)
+    point = np.repeat(np.arange(n), m)
+    obstacle = np.tile(np.arange(m), n)
+    return world._pair_distance(positions, point, obstacle).reshape(n, m).min(axis=1)
+
+def test_clearance_and_collisions_match_brute_force():
+    rng = np.random.default_rng(0)
+    world = random_world(rng)
+    positions = np.c_[rng.uniform(-20, 220, (400, 2)), rng.uniform(0, 60, 400)]
+    exact = brute_force_distance(world, positions)
+
+    assert np.allclose(world.clearance(positions), np.minimum(exact, world.cell_size))
+    assert np.array_equal(world.collisions(positions), exact < 0)
+    assert (exact < 0).any() and (exact > 0).any()
+
+def test_signed_distance_of_each_shape():
+    world = World([
+        {"type": "box", "min": [0, 0, 0], "max": [4, 2, 10]},
+        {"type": "cylinder", "center": [20, 20], "radius": 3, "z": [0, 15]},
+        {"type": "polygon", "vertices": [[40, 0], [50, 0], [50, 10], [45, 5], [40, 10]], "z": [5, None]},
+    ], cell_size=10.0)
+    positions = np.array([
+        [2, 1, 5],     # Inside the box, 1 from its side
+        [2, 1, 12],    # Above the box
+        [20, 25, 5],   # Beside the cylinder
+        [45, 2, 6],    # Inside the no-fly zone, 1 above its floor
+        [45, 7, 6],    # In the polygon's notch
+    ], dtype=float)
+    expected = [-1.0, 2.0, 2.0, -1.0, np.sqrt(2)]
+    assert np.allclose(world.clearance(positions), expected)
+
+def test_load_world(tmp_path):
+    path = tmp_path / "scenario.json"
+    path.write_text('{"cell_size": 5.0, "obstacles": '
+                    '[{"type": "cylinder", "center": [0, 0], "radius": 1.0}]}')
+    world = load_world(str(path))
+    assert world.cell_size == 5.0
+    assert world.collisions(np.array([[0.0, 0.0, 1e6]]))[0]  # Unbounded in z
+
+def test_unknown_obstacle_type():
+    with pytest.raises(ValueError):
+        World([{"type": "sphere"}])
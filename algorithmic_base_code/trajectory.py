@@ -0,0 +1,91 @@
+# precomputed minimum-jerk trajectories through waypoints:
+
+# libs:
+import numpy as np
+
+def quintic_coefficients(p0, v0, a0, p1, v1, a1, duration):
+    """(6, ...) coefficients of the quintic matching position, velocity and
+    acceleration at both ends of a segment (minimum jerk for those ends)"""
+    T = duration
+    dp = p1 - p0
+    return np.stack([
+        p0,
+        v0,
+        a0 / 2,
+        (20 * dp - (8 * v1 + 12 * v0) * T - (3 * a0 - a1) * T**2) / (2 * T**3),
+        (-30 * dp + (14 * v1 + 16 * v0) * T + (3 * a0 - 2 * a1) * T**2) / (2 * T**4),
+        (12 * dp - 6 * (v1 + v0) * T - (a0 - a1) * T**2) / (2 * T**5),
+    ])
+
+# class for the piecewise trajectory:
+class MinimumJerkTrajectory:
+    def __init__(self, waypoints, speed=2.0, start=(0.0, 0.0, 0.0), min_duration=0.5):
+        """Quintic segments from start through every waypoint, built once.
+
+        Segment durations follow the straight-line distance at the given
+        cruise speed. Interior waypoints are passed with the Catmull-Rom
+        velocity and zero acceleration; the route starts and ends at rest.
+        """
+        points = np.vstack([np.asarray(start, dtype=float), np.asarray(waypoints, dtype=float)])
+        durations = np.maximum(np.linalg.norm(np.diff(points, axis=0), axis=1) / speed, min_duration)
+
+        velocities = np.zeros_like(points)
+        velocities[1:-1] = (points[2:] - points[:-2]) / (durations[:-1] + durations[1:])[:, None]
+        accelerations = np.zeros_like(points)
+
+        # Cached per-segment coefficients, shape (segments, 6, 3), plus their derivatives
+        T = durations[:, None]
+        self.coefficients = np.moveaxis(quintic_coefficients(
+            points[:-1], velocities[:-1], accelerations[:-1],
+            points[1:], velocities[1:], accelerations[1:], T), 0, 1)
+        self.velocity_coefficients = self.coefficients[:, 1:] * np.arange(1, 6)[:, None]
+        self.acceleration_coefficients = self.velocity_coefficients[:, 1:] * np.arange(1, 5)[:, None]
+
+        self.points = points
+        self.times = np.concatenate([[0.0], np.cumsum(durations)])  # Segment start times
+        self.duration = self.times[-1]
+        self._segment = 0
+
+    def segment(self, t):
+        """Index of the segment containing t; checks the last one used and its
+        successor before falling back to a binary search"""
+        k = self._segment
+        times = self.times
+        if not times[k] <= t < times[k + 1]:
+            if k + 2 < len(times) and times[k + 1] <= t < times[k + 2]:
+                k += 1
+            else:
+                k = int(np.searchsorted(times, t, side="right")) - 1
+                k = min(max(k, 0), len(times) - 2)
+        self._segment = k
+        return k
+
+    def evaluate(self, t):
+        """Reference (position, velocity, acceleration) at time t; holds the
+        last waypoint after the end of the route"""
+        if t >= self.duration:
+            return self.points[-1].copy(), np.zeros(3), np.zeros(3)
+        t = max(t, 0.0)
+        k = self.segment(t)
+        tau = t - self.times[k]
+        return (_horner(self.coefficients[k], tau),
+                _horner(self.velocity_coefficients[k], tau),
+                _horner(self.acceleration_coefficients[k], tau))
+
+    def sample(self, t):
+        """Vectorized reference positions for an array of times, e.g. for plotting"""
+        t = np.clip(np.asarray(t, dtype=float), 0.0, self.duration)
+        k = np.clip(np.searchsorted(self.times, t, side="right") - 1, 0, len(self.times) - 2)
+        tau = (t - self.times[k])[..., None]
+        coefficients = self.coefficients[k]
+        position = coefficients[..., 5, :]
+        for i in range(4, -1, -1):
+            position = position * tau + coefficients[..., i, :]
+        return position
+
+def _horner(coefficients, tau):
+    result = coefficients[-1].copy()
+    for c in coefficients[-2::-1]:
+        result *= tau
+        result += c
+    return result
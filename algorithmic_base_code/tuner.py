@@ -0,0 +1,168 @@
+# PID gain auto-tuning on the batch simulator:
+
+# libs:
+import numpy as np
+from batch_sim import BatchDronesim
+from batch_controller import BatchPIDController
+
+DEFAULT_WEIGHTS = {"iae": 1.0, "overshoot": 1.0, "energy": 0.0, "settling_time": 0.0}
+
+def evaluate_gains(gains, target=(5.0, 5.0, 10.0), sim_time=10.0, dt=0.01,
+                   weights=None, tolerance=0.1, divergence_bound=100.0, check_every=50):
+    """Simulates one drone per (kp, ki, kd) row of gains and returns (costs, metrics).
+
+    Costs are a weighted sum of IAE, overshoot (fraction of the start
+    distance overshot past the target), energy and settling time. Every
+    check_every steps, candidates whose error exceeded divergence_bound are
+    dropped from the batch and get an infinite cost.
+    """
+    weights = dict(DEFAULT_WEIGHTS, **(weights or {}))
+    gains = np.atleast_2d(np.asarray(gains, dtype=float))
+    m = len(gains)
+    target = np.asarray(target, dtype=float)
+    steps = int(sim_time / dt)
+
+    start_distance = np.linalg.norm(target)
+    direction = target / start_distance
+
+    metrics = {name: np.full(m, np.inf) for name in ("iae", "overshoot", "energy", "settling_time")}
+    alive = np.arange(m)  # Candidate index of every drone still in the batch
+    drone = BatchDronesim(m, dt=dt)
+    controller = BatchPIDController(m, kp=gains[:, 0], ki=gains[:, 1], kd=gains[:, 2])
+    iae = np.zeros(m)
+    energy = np.zeros(m)
+    overshoot = np.zeros(m)
+    last_outside = np.zeros(m)
+    targets = np.broadcast_to(target, (m, 3))
+
+    for step in range(steps):
+        controls = controller.control(drone.get_positions(), targets, drone.get_velocities())
+        energy += controls[:, 0] * dt
+        drone.update(controls)
+
+        error_vec = drone.get_positions() - target
+        error = np.linalg.norm(error_vec, axis=1)
+        iae += error * dt
+        np.maximum(overshoot, error_vec @ direction / start_distance, out=overshoot)
+        last_outside[error > tolerance] = (step + 1) * dt
+
+        if (step + 1) % check_every == 0:
+            keep = np.isfinite(error) & (error < divergence_bound)
+            if not keep.all():
+                if not keep.any():
+                    return _costs(metrics, weights), metrics
+                alive, iae, energy, overshoot, last_outside = (
+                    a[keep] for a in (alive, iae, energy, overshoot, last_outside))
+                drone, controller = _subset(drone, controller, keep)
+                targets = np.broadcast_to(target, (len(alive), 3))
+
+    settled = last_outside < steps * dt
+    metrics["iae"][alive] = iae
+    metrics["overshoot"][alive] = overshoot
+    metrics["energy"][alive] = energy
+    metrics["settling_time"][alive] = np.where(settled, last_outside, np.inf)
+    return _costs(metrics, weights), metrics
+
+def _costs(metrics, weights):
+    costs = np.zeros(len(metrics["iae"]))
+    for name, weight in weights.items():
+        if weight:
+            costs += weight * metrics[name]
+    # A diverged candidate is infinitely bad whatever the weights are
+    costs[~np.isfinite(metrics["iae"])] = np.inf
+    return costs
+
+def _subset(drone, controller, keep):
+    """Rebuilds the batch with only the kept drones"""
+    n = int(keep.sum())
+    new_drone = BatchDronesim(n, mass=drone.mass[keep], max_thrust=drone.max_thrust[keep],
+                              max_tilt=drone.max_tilt[keep], dt=drone.dt,
+                              initial_states=drone.states[keep])
+    new_controller = BatchPIDController(n, kp=controller.kp[keep, 0], ki=controller.ki[keep, 0],
+                                        kd=controller.kd[keep, 0],
+                                        max_thrust=controller.max_thrust[keep], g=controller.g)
+    new_controller.error_integral[:] = controller.error_integral[keep]
+    return new_drone, new_controller
+
+def _evaluate_chunk(args):
+    gains, kwargs = args
+    return evaluate_gains(gains, **kwargs)
+
+def evaluate(gains, max_workers=None, chunk_size=256, **kwargs):
+    """evaluate_gains, split into chunks over a process pool when max_workers > 1"""
+    gains = np.atleast_2d(np.asarray(gains, dtype=float))
+    if not max_workers or max_workers <= 1 or len(gains) <= chunk_size:
+        return evaluate_gains(gains, **kwargs)
+
+    from concurrent.futures import ProcessPoolExecutor
+    chunks = [(gains[i:i + chunk_size], kwargs) for i in range(0, len(gains), chunk_size)]
+    with ProcessPoolExecutor(max_workers=max_workers) as pool:
+        parts = list(pool.map(_evaluate_chunk, chunks))
+    costs = np.concatenate([c for c, _ in parts])
+    metrics = {name: np.concatenate([m[name] for _, m in parts]) for name in parts[0][1]}
+    return costs, metrics
+
+# search strategies:
+def grid_search(kp_range=(0.1, 10.0), ki_range=(0.001, 1.0), kd_range=(0.1, 10.0),
+                points=6, levels=3, zoom=0.3, **kwargs):
+    """Coarse-to-fine log-spaced grid search; each level zooms in on the best
+    gains, staying inside the given ranges. Returns (None, inf, history) if
+    every candidate of the first level diverged."""
+    bounds = np.log10([kp_range, ki_range, kd_range])
+    ranges = bounds.copy()
+    best_gains, best_cost, history = None, np.inf, []
+
+    for _ in range(levels):
+        axes = [np.logspace(low, high, points) for low, high in ranges]
+        gains = np.stack(np.meshgrid(*axes, indexing="ij"), axis=-1).reshape(-1, 3)
+        costs, _ = evaluate(gains, **kwargs)
+        history.append((gains, costs))
+
+        i = int(np.argmin(costs))
+        if costs[i] < best_cost:
+            best_gains, best_cost = gains[i], costs[i]
+        if best_gains is None:
+            break  # Nothing finite to zoom in on
+
+        # Shrink each range around the best point (in log space)
+        center = np.log10(best_gains)
+        half = (ranges[:, 1] - ranges[:, 0]) * zoom / 2
+        ranges = np.clip(np.stack([center - half, center + half], axis=1),
+                         bounds[:, :1], bounds[:, 1:])
+
+    return best_gains, best_cost, history
+
+def successive_halving(n_candidates=243, eta=3, min_time=2.0, max_time=10.0,
+                       kp_range=(0.1, 10.0), ki_range=(0.001, 1.0), kd_range=(0.1, 10.0),
+                       seed=0, **kwargs):
+    """Samples log-uniform gains and keeps the best 1/eta each round while
+    the simulated horizon grows by eta, so bad candidates stop early."""
+    rng = np.random.default_rng(seed)
+    low = np.log10([kp_range[0], ki_range[0], kd_range[0]])
+    high = np.log10([kp_range[1], ki_range[1], kd_range[1]])
+    gains = 10 ** rng.uniform(low, high, (n_candidates, 3))
+    sim_time = min_time
+
+    while True:
+        costs, _ = evaluate(gains, sim_time=sim_time, **kwargs)
+        order = np.argsort(costs)
+        if len(gains) <= eta or sim_time >= max_time:
+            return gains[order[0]], costs[order[0]]
+        survivors = order[:max(1, len(gains) // eta)]
+        survivors = survivors[np.isfinite(costs[survivors])]
+        if len(survivors) == 0:
+            return gains[order[0]], costs[order[0]]
+        gains = gains[survivors]
+        sim_time = min(sim_time * eta, max_time)
+
+if __name__ == "__main__":
+    default_cost, _ = evaluate_gains([[2.0, 0.1, 0.5]])
+    print(f"Default gains kp=2.0 ki=0.1 kd=0.5: cost {default_cost[0]:.3f}")
+
+    gains, cost, _ = grid_search()
+    if gains is None:
+        print("Grid search:        every candidate diverged")
+    else:
+        print(f"Grid search:        kp={gains[0]:.3f} ki={gains[1]:.4f} kd={gains[2]:.3f} cost {cost:.3f}")
+    gains, cost = successive_halving()
+    print(f"Successive halving: kp={gains[0]:.3f} ki={gains[1]:.4f} kd={gains[2]:.3f} cost {cost:.3f}")
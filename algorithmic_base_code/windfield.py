@@ -0,0 +1,119 @@
+# precomputed turbulence wind field with trilinear lookup:
+#
+# Turbulence is generated once on a periodic 3D grid by filtering white noise
+# in the Fourier domain with a Dryden or von Karman spectrum. Time variation
+# follows Taylor's frozen-turbulence hypothesis: the field is carried along
+# by the mean wind, so a 3D grid covers space and time.
+
+# libs:
+import hashlib
+import json
+import os
+import numpy as np
+
+def energy_spectrum(k, length_scale, model="von_karman"):
+    """Unnormalized isotropic energy spectrum E(k)"""
+    kl = (k * length_scale) ** 2
+    if model == "von_karman":
+        return kl**2 / (1 + kl) ** (17 / 6)
+    if model == "dryden":
+        return kl**2 / (1 + kl) ** 3
+    raise ValueError(f"unknown turbulence model {model!r}")
+
+def turbulence(shape=(64, 64, 32), spacing=5.0, length_scale=50.0, sigma=1.0,
+               model="von_karman", seed=0):
+    """(nx, ny, nz, 3) divergence-free velocity field with per-component std sigma"""
+    rng = np.random.default_rng(seed)
+    noise = np.fft.rfftn(rng.standard_normal((3,) + tuple(shape)), axes=(1, 2, 3))
+
+    kx = 2 * np.pi * np.fft.fftfreq(shape[0], spacing)[:, None, None]
+    ky = 2 * np.pi * np.fft.fftfreq(shape[1], spacing)[None, :, None]
+    kz = 2 * np.pi * np.fft.rfftfreq(shape[2], spacing)[None, None, :]
+    k2 = kx**2 + ky**2 + kz**2
+    k2[0, 0, 0] = 1.0  # The mean is zeroed below
+
+    # Amplitude sqrt(E(k) / 4 pi k^2), then projection onto k-perpendicular
+    # vectors so the field is incompressible
+    amplitude = np.sqrt(energy_spectrum(np.sqrt(k2), length_scale, model) / (4 * np.pi * k2))
+    amplitude[0, 0, 0] = 0.0
+    noise *= amplitude
+    k = (kx, ky, kz)
+    dot = sum(k[i] * noise[i] for i in range(3)) / k2
+    for i in range(3):
+        noise[i] -= k[i] * dot
+
+    field = np.fft.irfftn(noise, s=shape, axes=(1, 2, 3))
+    field *= sigma / field.std(axis=(1, 2, 3))[:, None, None, None]
+    return np.ascontiguousarray(np.moveaxis(field, 0, -1), dtype=np.float32)
+
+def cached_turbulence(cache_dir, **parameters):
+    """turbulence(**parameters), stored as .npy under a hash of the parameters
+    and memory-mapped on later calls"""
+    text = json.dumps({name: list(value) if isinstance(value, tuple) else value
+                       for name, value in parameters.items()}, sort_keys=True)
+    path = os.path.join(cache_dir, "wind_" + hashlib.sha256(text.encode()).hexdigest()[:16] + ".npy")
+    if not os.path.exists(path):
+        os.makedirs(cache_dir, exist_ok=True)
+        tmp = path + ".tmp.npy"
+        np.save(tmp, turbulence(**parameters))
+        os.replace(tmp, path)
+    return np.load(path, mmap_mode="r")
+
+# class for the wind field:
+class WindField:
+    def __init__(self, mean=(0.0, 0.0, 0.0), shape=(64, 64, 32), spacing=5.0,
+                 length_scale=50.0, sigma=1.0, model="von_karman", seed=0,
+                 gusts=(), drag=0.3, cache_dir=None):
+        """Wind = mean + frozen turbulence + discrete gusts.
+
+        gusts is a list of (start, duration, (gx, gy, gz)) 1-cosine gusts.
+        drag (1/s) turns air velocity relative to the drone into the
+        disturbance acceleration fed to the simulators.
+        """
+        parameters = dict(shape=tuple(shape), spacing=spacing, length_scale=length_scale,
+                          sigma=sigma, model=model, seed=seed)
+        if cache_dir is None:
+            self.field = turbulence(**parameters)
+        else:
+            self.field = np.asarray(cached_turbulence(cache_dir, **parameters))
+        self.mean = np.asarray(mean, dtype=float)
+        self.shape = np.array(shape)
+        self.spacing = spacing
+        self.gusts = [(start, duration, np.asarray(amplitude, dtype=float))
+                      for start, duration, amplitude in gusts]
+        self.drag = drag
+
+    def turbulence_at(self, positions, t=0.0):
+        """(N, 3) turbulent velocity at (N, 3) positions by trilinear
+        interpolation; the periodic grid tiles all of space"""
+        grid = (np.atleast_2d(positions) - self.mean * t) / self.spacing
+        base = np.floor(grid)
+        frac = grid - base
+        base = base.astype(np.int64)
+
+        result = np.zeros((len(grid), 3))
+        for corner in range(8):
+            offset = np.array([(corner >> 2) & 1, (corner >> 1) & 1, corner & 1])
+            index = (base + offset) % self.shape
+            weight = np.prod(np.where(offset, frac, 1.0 - frac), axis=1)
+            result += weight[:, None] * self.field[index[:, 0], index[:, 1], index[:, 2]]
+        return result
+
+    def gust(self, t):
+        wind = np.zeros(3)
+        for start, duration, amplitude in self.gusts:
+            if start <= t < start + duration:
+                wind += amplitude * 0.5 * (1 - np.cos(2 * np.pi * (t - start) / duration))
+        return wind
+
+    def velocity(self, positions, t=0.0):
+        """(N, 3) wind velocity at (N, 3) positions"""
+        return self.turbulence_at(positions, t) + self.mean + self.gust(t)
+
+    def disturbance(self, states, t=0.0, offsets=None):
+        """(N, 3) drag acceleration for (N, 6) states, as passed to
+        BatchDronesim.update(disturbance=...). offsets shift each drone into
+        a different part of the field, e.g. one offset per Monte Carlo trial."""
+        states = np.atleast_2d(states)
+        positions = states[:, :3] if offsets is None else states[:, :3] + offsets
+        return self.drag * (self.velocity(positions, t) - states[:, 3:6])
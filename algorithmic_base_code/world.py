@@ -0,0 +1,260 @@
+# static obstacles and no-fly zones with a grid broad-phase:
+#
+# Every obstacle is a vertical prism between z_min and z_max over a
+# footprint: a box (axis-aligned rectangle), a cylinder (circle) or a
+# no-fly zone (polygon). Footprints are registered in a uniform 2D grid so a
+# query only tests the obstacles near each position.
+
+# libs:
+import json
+import numpy as np
+
+BOX, CYLINDER, POLYGON = 0, 1, 2
+
+# class for the obstacle world:
+class World:
+    def __init__(self, obstacles, cell_size=10.0):
+        """obstacles is a list of dicts as in a scenario file (see load_world)"""
+        self.cell_size = float(cell_size)
+        m = len(obstacles)
+        self.kind = np.zeros(m, dtype=np.int8)
+        self.center = np.zeros((m, 2))
+        self.half = np.zeros((m, 2))  # Box half sizes
+        self.radius = np.zeros(m)     # Cylinder radii
+        self.z_range = np.zeros((m, 2))
+        self.polygons = {}            # Obstacle index -> (k, 2) vertices
+        bounds = np.zeros((m, 4))     # Footprint AABBs [x0, y0, x1, y1]
+
+        for i, obstacle in enumerate(obstacles):
+            z = obstacle.get("z", [None, None])
+            self.z_range[i] = [-np.inf if z[0] is None else z[0], np.inf if z[1] is None else z[1]]
+            kind = obstacle["type"]
+            if kind == "box":
+                low, high = np.asarray(obstacle["min"], dtype=float), np.asarray(obstacle["max"], dtype=float)
+                self.kind[i] = BOX
+                self.center[i] = (low[:2] + high[:2]) / 2
+                self.half[i] = (high[:2] - low[:2]) / 2
+                self.z_range[i] = [low[2], high[2]]
+                bounds[i] = [low[0], low[1], high[0], high[1]]
+            elif kind == "cylinder":
+                self.kind[i] = CYLINDER
+                self.center[i] = obstacle["center"]
+                self.radius[i] = obstacle["radius"]
+                bounds[i] = np.concatenate([self.center[i] - self.radius[i], self.center[i] + self.radius[i]])
+            elif kind == "polygon":
+                vertices = np.asarray(obstacle["vertices"], dtype=float)
+                self.kind[i] = POLYGON
+                self.polygons[i] = vertices
+                bounds[i] = np.concatenate([vertices.min(axis=0), vertices.max(axis=0)])
+            else:
+                raise ValueError(f"unknown obstacle type {kind!r}")
+        self.shapes = np.unique(self.kind).tolist()
+        self._build_grid(bounds)
+
+    def _build_grid(self, bounds):
+        """CSR layout: obstacles of cell c are cell_items[cell_start[c]:cell_start[c + 1]]"""
+        m = len(bounds)
+        if m:
+            self.origin = np.floor(bounds[:, :2].min(axis=0) / self.cell_size) * self.cell_size
+            self.shape = (np.floor((bounds[:, 2:].max(axis=0) - self.origin) / self.cell_size)
+                          .astype(np.int64) + 1)
+        else:
+            self.origin, self.shape = np.zeros(2), np.ones(2, dtype=np.int64)
+
+        low = np.floor((bounds[:, :2] - self.origin) / self.cell_size).astype(np.int64)
+        high = np.floor((bounds[:, 2:] - self.origin) / self.cell_size).astype(np.int64)
+        keys, items = [], []
+        for i in range(m):
+            ix, iy = np.meshgrid(np.arange(low[i, 0], high[i, 0] + 1),
+                                 np.arange(low[i, 1], high[i, 1] + 1), indexing="ij")
+            keys.append((ix * self.shape[1] + iy).ravel())
+            items.append(np.full(ix.size, i))
+        keys = np.concatenate(keys) if keys else np.zeros(0, dtype=np.int64)
+        items = np.concatenate(items) if items else np.zeros(0, dtype=np.int64)
+
+        order = np.argsort(keys, kind="stable")
+        self.cell_items = items[order]
+        counts = np.bincount(keys, minlength=int(self.shape.prod()))
+        self.cell_start = np.concatenate([[0], np.cumsum(counts)])
+        self._cell_ranges = self.cell_start.tolist()  # For the single-position path
+
+        # Cell offsets of the query neighborhoods, built once per reach
+        self._offsets = {}
+        for reach in (0, 1):
+            steps = np.arange(-reach, reach + 1)
+            self._offsets[reach] = np.stack(np.meshgrid(steps, steps, indexing="ij"),
+                                            axis=-1).reshape(-1, 2)
+
+    def __len__(self):
+        return len(self.kind)
+
+    def _candidates(self, positions, reach):
+        """(point, obstacle) pairs from the cells within reach cells of each point"""
+        cells = np.floor((positions[:, :2] - self.origin) / self.cell_size).astype(np.int64)
+        cells = cells[:, None, :] + self._offsets[reach]  # (N, cells, 2)
+        inside = np.all((cells >= 0) & (cells < self.shape), axis=2)
+        keys = np.where(inside, cells[..., 0] * self.shape[1] + cells[..., 1], 0)
+
+        start = self.cell_start[keys]
+        counts = np.where(inside, self.cell_start[keys + 1] - start, 0).ravel()
+        start = start.ravel()
+        total = int(counts.sum())
+        point = np.repeat(np.arange(len(positions)), counts.reshape(len(positions), -1).sum(axis=1))
+        run = np.arange(total) - np.repeat(np.cumsum(counts) - counts, counts)
+        obstacle = self.cell_items[np.repeat(start, counts) + run]
+        return point, obstacle
+
+    def _nearby(self, position, reach):
+        """Obstacles registered in the cells within reach of a single position
+        (None if there are none), without the per-pair arrays of _candidates"""
+        cx = int(np.floor((position[0] - self.origin[0]) / self.cell_size))
+        cy = int(np.floor((position[1] - self.origin[1]) / self.cell_size))
+        nx, ny = int(self.shape[0]), int(self.shape[1])
+        ranges = self._cell_ranges
+        pieces = []
+        for ix in range(max(cx - reach, 0), min(cx + reach + 1, nx)):
+            for iy in range(max(cy - reach, 0), min(cy + reach + 1, ny)):
+                key = ix * ny + iy
+                if ranges[key + 1] > ranges[key]:
+                    pieces.append(self.cell_items[ranges[key]:ranges[key + 1]])
+        if not pieces:
+            return None
+        return pieces[0] if len(pieces) == 1 else np.concatenate(pieces)
+
+    def _pair_distance(self, positions, point, obstacle):
+        """Signed distance of each (point, obstacle) pair; negative inside"""
+        return self._distance(positions[point, :2], positions[point, 2], obstacle)
+
+    def _distance(self, xy, z, obstacle):
+        """Signed distance from points (xy, z) to each obstacle; xy is (k, 2),
+        or (2,) and z a scalar for a single position"""
+        footprint = np.empty(len(obstacle))
+        single = xy.ndim == 1
+
+        # Only the shapes present in the world are evaluated, without masks
+        # when there is just one
+        kind = self.kind[obstacle] if len(self.shapes) > 1 else None
+        for shape in self.shapes:
+            rows = slice(None) if kind is None else np.flatnonzero(kind == shape)
+            if kind is not None and not len(rows):
+                continue
+            i = obstacle[rows]
+            p = xy if single else xy[rows]
+            if shape == BOX:
+                q = np.abs(p - self.center[i]) - self.half[i]
+                footprint[rows] = np.linalg.norm(np.maximum(q, 0.0), axis=1) + np.minimum(q.max(axis=1), 0.0)
+            elif shape == CYLINDER:
+                footprint[rows] = np.linalg.norm(p - self.center[i], axis=1) - self.radius[i]
+            else:
+                rows = np.arange(len(obstacle))[rows]
+                for j in np.unique(i):
+                    own = rows[i == j]
+                    footprint[own] = _polygon_distance(self.polygons[j],
+                                                       np.broadcast_to(xy, (len(own), 2)) if single else xy[own])
+
+        # Combine the footprint and vertical extents like a 2D box distance
+        z_range = self.z_range[obstacle]
+        vertical = np.maximum(z_range[:, 0] - z, z - z_range[:, 1])
+        outside = np.hypot(np.maximum(footprint, 0.0), np.maximum(vertical, 0.0))
+        return outside + np.minimum(np.maximum(footprint, vertical), 0.0)
+
+    def clearance(self, positions, max_distance=None):
+        """(N,) distance to the nearest obstacle surface (negative inside one),
+        capped at max_distance (default and maximum: cell_size)"""
+        positions = np.atleast_2d(positions)
+        max_distance = self.cell_size if max_distance is None else min(max_distance, self.cell_size)
+        if len(positions) == 1:
+            obstacle = self._nearby(positions[0], 1)
+            if obstacle is None:
+                return np.array([max_distance])
+            distance = self._distance(positions[0, :2], positions[0, 2], obstacle)
+            return np.array([min(distance.min(), max_distance)])
+
+        result = np.full(len(positions), max_distance)
+        point, obstacle = self._candidates(positions, 1)
+        if len(point):
+            # point is sorted, so each position's pairs are one contiguous run
+            distance = self._pair_distance(positions, point, obstacle)
+            starts = np.flatnonzero(np.r_[True, point[1:] != point[:-1]])
+            owners = point[starts]
+            result[owners] = np.minimum(result[owners], np.minimum.reduceat(distance, starts))
+        return result
+
+    def collisions(self, positions):
+        """(N,) True where a position is inside an obstacle"""
+        positions = np.atleast_2d(positions)
+        if len(positions) == 1:
+            obstacle = self._nearby(positions[0], 0)  # Only the point's own cell
+            return np.array([obstacle is not None and
+                             bool((self._distance(positions[0, :2], positions[0, 2], obstacle) < 0.0).any())])
+
+        hit = np.zeros(len(positions), dtype=bool)
+        point, obstacle = self._candidates(positions, 0)  # Only the point's own cell
+        if len(point):
+            hit[point[self._pair_distance(positions, point, obstacle) < 0.0]] = True
+        return hit
+
+def _polygon_distance(vertices, points):
+    """Signed distance from points (k, 2) to a polygon outline; negative inside"""
+    a = vertices
+    b = np.roll(vertices, -1, axis=0)
+    edge = b - a
+    rel = points[:, None, :] - a  # (k, edges, 2)
+    along = np.clip(np.sum(rel * edge, axis=2) / np.maximum(np.sum(edge * edge, axis=1), 1e-12), 0.0, 1.0)
+    distance = np.linalg.norm(rel - along[..., None] * edge, axis=2).min(axis=1)
+
+    # Even-odd rule with a ray towards +x
+    y = points[:, 1:2]
+    straddles = (a[:, 1] > y) != (b[:, 1] > y)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        x_cross = a[:, 0] + (y - a[:, 1]) * edge[:, 0] / edge[:, 1]
+    inside = np.count_nonzero(straddles & (points[:, 0:1] < x_cross), axis=1) % 2 == 1
+    return np.where(inside, -distance, distance)
+
+def load_world(path):
+    """Reads a scenario file:
+
+    {"cell_size": 10.0,
+     "obstacles": [
+        {"type": "box", "min": [x, y, z], "max": [x, y, z]},
+        {"type": "cylinder", "center": [x, y], "radius": r, "z": [z0, z1]},
+        {"type": "polygon", "vertices": [[x, y], ...], "z": [z0, null]}]}
+
+    A null z bound is unbounded; "z" defaults to [null, null].
+    """
+    with open(path) as f:
+        scenario = json.load(f)
+    return World(scenario.get("obstacles", []), cell_size=scenario.get("cell_size", 10.0))
+
+# class for per-run collision and clearance metrics:
+class ClearanceMonitor:
+    def __init__(self, world, n_drones=1, max_distance=None):
+        self.world = world
+        self.max_distance = max_distance
+        self.min_clearance = np.full(n_drones, np.inf)
+        self.collision_steps = np.zeros(n_drones, dtype=int)
+        self.first_collision = np.full(n_drones, np.nan)
+
+    def update(self, t, positions):
+        clearance = self.world.clearance(positions, self.max_distance)
+        np.minimum(self.min_clearance, clearance, out=self.min_clearance)
+        colliding = clearance < 0.0
+        self.collision_steps += colliding
+        self.first_collision[colliding & np.isnan(self.first_collision)] = t
+        return clearance
+
+    def summary(self):
+        """Metrics as plain values for one drone, or arrays for a batch
+        (first_collision is None / NaN for drones that never collided)"""
+        if len(self.min_clearance) == 1:
+            first = self.first_collision[0]
+            return {
+                "min_clearance": float(self.min_clearance[0]),
+                "collision_steps": int(self.collision_steps[0]),
+                "first_collision": None if np.isnan(first) else float(first),
+            }
+        return {
+            "min_clearance": self.min_clearance,
+            "collision_steps": self.collision_steps,
+            "first_collision": self.first_collision,
+        }
@@ -1,14 +1,11 @@
 import pygame
 import math
-
-# Initialize Pygame
-pygame.init()
+from renderer import SceneRenderer
 
 # Screen settings
 WIDTH = 800
 HEIGHT = 600
-screen = pygame.display.set_mode((WIDTH, HEIGHT))
-pygame.display.set_caption("Autonomous Flight Simulator")
+screen = None  # Created by FlightSimulator unless running headless
 
 # Colors
 WHITE = (255, 255, 255)
@@ -27,6 +24,7 @@ class Drone:
         self.target_altitude = None
         self.target_x = None
         self.is_landed = True
+        self.verbose = True
         
     def update(self, dt):
         gravity = 9.81
@@ -51,11 +49,18 @@ class Drone:
             # Screen boundaries
             self.x = max(0, min(self.x, WIDTH - self.size))
         
-    def draw(self, screen):
-        pygame.draw.rect(screen, BLUE, (int(self.x), int(self.y), self.size, self.size))
+    def draw(self, renderer, x=None, y=None):
+        # x, y override the drawn position (used for interpolated rendering)
+        x = self.x if x is None else x
+        y = self.y if y is None else y
+        renderer.set_rect(("drone", id(self)), BLUE, (int(x), int(y), self.size, self.size))
         
+    def log(self, message):
+        if self.verbose:
+            print(message)
+            
     def takeoff(self):
-        print("Taking off...")
+        self.log("Taking off...")
         self.is_landed = False
         self.target_altitude = HEIGHT - 200  # Target 200 pixels up
         self.thrust = 15.0  # More than gravity*mass (9.81)
@@ -65,26 +70,57 @@ class Drone:
             error = self.target_altitude - self.y
             self.thrust = (self.mass * 9.81) + (error * 0.5)  # Basic P control
             self.velocity_x = 0
-            print(f"Hovering: thrust={self.thrust:.2f}, y={self.y:.2f}")
+            self.log(f"Hovering: thrust={self.thrust:.2f}, y={self.y:.2f}")
             
     def move_to(self, x_target):
         self.target_x = x_target
         error = x_target - self.x
         self.velocity_x = error * 0.2  # Increased gain
-        print(f"Moving: vx={self.velocity_x:.2f}, x={self.x:.2f}")
+        self.log(f"Moving: vx={self.velocity_x:.2f}, x={self.x:.2f}")
         
     def land(self):
         self.target_altitude = HEIGHT - self.size
         self.thrust = 5.0  # Less than gravity for descent
         self.velocity_x = 0
-        print("Landing...")
+        self.log("Landing...")
+
+# Keys that enter each state (see FlightSimulator.handle_key)
+STATE_KEYS = {"TAKEOFF": pygame.K_t, "HOVER": pygame.K_h, "MOVING": pygame.K_m, "LANDING": pygame.K_l}
 
 class FlightSimulator:
-    def __init__(self):
+    def __init__(self, headless=False, physics_hz=500, max_frame_time=0.25, control_hz=60):
+        global screen
         self.drone = Drone(WIDTH//2, HEIGHT-20)
         self.clock = pygame.time.Clock()
         self.running = True
         self.state = "IDLE"
+        self.headless = headless
+        
+        # Physics runs at a fixed rate independent of the render frame rate
+        self.physics_dt = 1.0 / physics_hz
+        self.max_frame_time = max_frame_time  # Avoids a spiral of catch-up steps
+        self.accumulator = 0.0
+        self.previous_position = (self.drone.x, self.drone.y)
+        
+        # The state machine (and its logging) runs at the control rate, not every physics step
+        self.control_hz = control_hz
+        self.control_every = self.control_period(self.physics_dt)
+        self.physics_steps = 0
+        
+        if headless:
+            self.drone.verbose = False
+        else:
+            if screen is None:
+                # Initialize Pygame only when a window is needed
+                pygame.init()
+                screen = pygame.display.set_mode((WIDTH, HEIGHT))
+                pygame.display.set_caption("Autonomous Flight Simulator")
+                
+            # Static scene, drawn once and used to erase moving items
+            background = pygame.Surface((WIDTH, HEIGHT))
+            background.fill(WHITE)
+            pygame.draw.line(background, BLACK, (0, HEIGHT-2), (WIDTH, HEIGHT-2), 2)
+            self.renderer = SceneRenderer(screen, background)
         
     def update_drone_state(self):
         if self.state == "TAKEOFF":
@@ -106,47 +142,123 @@ class FlightSimulator:
             if self.drone.is_landed:
                 self.state = "IDLE"
                 
-    def run(self):
+    def handle_key(self, key):
+        if key == pygame.K_t and self.state == "IDLE":
+            self.state = "TAKEOFF"
+        elif key == pygame.K_h and self.state != "IDLE":
+            self.state = "HOVER"
+        elif key == pygame.K_m and self.state != "IDLE":
+            self.state = "MOVING"
+            self.drone.target_x = 600
+        elif key == pygame.K_l and self.state != "IDLE":
+            self.state = "LANDING"
+                
+    def control_period(self, dt):
+        """Physics steps of dt seconds per state machine update"""
+        return max(1, round(1.0 / (self.control_hz * dt)))
+        
+    def step_physics(self, dt):
+        self.previous_position = (self.drone.x, self.drone.y)
+        if self.physics_steps % self.control_every == 0:
+            self.update_drone_state()
+        self.physics_steps += 1
+        self.drone.update(dt)
+                
+    def interpolated_position(self):
+        """Drone position blended between the last two physics states"""
+        alpha = self.accumulator / self.physics_dt
+        x0, y0 = self.previous_position
+        return (x0 + (self.drone.x - x0) * alpha,
+                y0 + (self.drone.y - y0) * alpha)
+                
+    def run_headless(self, schedule, dt=None, duration=10.0, stop_when_idle=False):
+        """Runs without a window as fast as possible and returns the telemetry log.
+        
+        schedule is a list of (time, event) pairs where event is a pygame key
+        code or a state name ("TAKEOFF", "HOVER", "MOVING", "LANDING"); both
+        go through handle_key, so a name gets the same setup as its key.
+        """
+        dt = self.physics_dt if dt is None else dt
+        # Keep the control rate at control_hz for the step size actually used
+        control_every, self.control_every = self.control_every, self.control_period(dt)
+        schedule = sorted(schedule, key=lambda item: item[0])
+        telemetry = []
+        next_event = 0
+        t = 0.0
+        
+        for step in range(int(round(duration / dt))):
+            while next_event < len(schedule) and schedule[next_event][0] <= t:
+                event = schedule[next_event][1]
+                if isinstance(event, str):
+                    if event not in STATE_KEYS:
+                        raise ValueError(f"unknown state {event!r}; expected one of {sorted(STATE_KEYS)}")
+                    event = STATE_KEYS[event]
+                self.handle_key(event)
+                next_event += 1
+                
+            self.step_physics(dt)
+            t = (step + 1) * dt
+            telemetry.append({
+                "time": t,
+                "state": self.state,
+                "x": self.drone.x,
+                "y": self.drone.y,
+                "altitude": HEIGHT - self.drone.y,
+                "velocity_x": self.drone.velocity_x,
+                "velocity_y": self.drone.velocity_y,
+                "thrust": self.drone.thrust,
+            })
+            
+            if stop_when_idle and self.state == "IDLE" and next_event == len(schedule):
+                break
+                
+        self.control_every = control_every
+        return telemetry
+                
+    def run(self, profiler=None):
+        """Interactive loop. profiler (algorithmic_base_code/profiling.py) times
+        the wait, events, physics and render phases and reports on exit."""
         while self.running:
-            dt = self.clock.tick(60) / 1000.0  # Delta time in seconds
+            if profiler is not None:
+                profiler.begin_step()
+            frame_time = self.clock.tick(60) / 1000.0  # Delta time in seconds
+            self.accumulator += min(frame_time, self.max_frame_time)
+            if profiler is not None:
+                profiler.lap("wait")
             
             for event in pygame.event.get():
                 if event.type == pygame.QUIT:
                     self.running = False
                 if event.type == pygame.KEYDOWN:
-                    if event.key == pygame.K_t and self.state == "IDLE":
-                        self.state = "TAKEOFF"
-                    elif event.key == pygame.K_h and self.state != "IDLE":
-                        self.state = "HOVER"
-                    elif event.key == pygame.K_m and self.state != "IDLE":
-                        self.state = "MOVING"
-                        self.drone.target_x = 600
-                    elif event.key == pygame.K_l and self.state != "IDLE":
-                        self.state = "LANDING"
+                    self.handle_key(event.key)
+            if profiler is not None:
+                profiler.lap("events")
             
-            # Update drone state and physics
-            self.update_drone_state()
-            self.drone.update(dt)
+            # Update drone state and physics in fixed steps
+            while self.accumulator >= self.physics_dt:
+                self.step_physics(self.physics_dt)
+                self.accumulator -= self.physics_dt
+                if profiler is not None:
+                    profiler.count("physics_steps")
+            if profiler is not None:
+                profiler.lap("physics")
             
-            # Draw
-            screen.fill(WHITE)
-            pygame.draw.line(screen, BLACK, (0, HEIGHT-2), (WIDTH, HEIGHT-2), 2)
-            self.drone.draw(screen)
+            # Draw (only changed items are repainted)
+            self.drone.draw(self.renderer, *self.interpolated_position())
             
             # Display info
-            font = pygame.font.Font(None, 36)
-            text = font.render(f"State: {self.state}", True, BLACK)
-            screen.blit(text, (10, 10))
-            text = font.render(f"Alt: {HEIGHT - self.drone.y:.1f}", True, BLACK)
-            screen.blit(text, (10, 50))
-            text = font.render(f"X: {self.drone.x:.1f}", True, BLACK)
-            screen.blit(text, (10, 90))
-            text = font.render(f"Thrust: {self.drone.thrust:.1f}", True, BLACK)
-            screen.blit(text, (10, 130))
+            self.renderer.set_text("state", f"State: {self.state}", (10, 10))
+            self.renderer.set_text("alt", f"Alt: {HEIGHT - self.drone.y:.1f}", (10, 50))
+            self.renderer.set_text("x", f"X: {self.drone.x:.1f}", (10, 90))
+            self.renderer.set_text("thrust", f"Thrust: {self.drone.thrust:.1f}", (10, 130))
             
-            pygame.display.flip()
+            self.renderer.present()
+            if profiler is not None:
+                profiler.lap("render")
         
         pygame.quit()
+        if profiler is not None and profiler.enabled:
+            print(profiler.report())
 
 if __name__ == "__main__":
     sim = FlightSimulator()
@@ -0,0 +1,86 @@
+import pygame
+from collections import OrderedDict
+
+# Colors
+WHITE = (255, 255, 255)
+BLACK = (0, 0, 0)
+
+class TextCache:
+    """Creates the font once and reuses rendered text surfaces"""
+    def __init__(self, font_size=36, background=None, max_entries=256):
+        self.font = pygame.font.Font(None, font_size)
+        self.background = background  # Opaque text can be redrawn over itself
+        self.max_entries = max_entries
+        self.surfaces = OrderedDict()
+
+    def render(self, text, color=BLACK):
+        key = (text, color)
+        surface = self.surfaces.get(key)
+        if surface is None:
+            surface = self.font.render(text, True, color, self.background)
+            self.surfaces[key] = surface
+            if len(self.surfaces) > self.max_entries:
+                self.surfaces.popitem(last=False)
+        else:
+            self.surfaces.move_to_end(key)
+        return surface
+
+class SceneRenderer:
+    """Keeps what was drawn last frame and only repaints the parts that changed.
+
+    Each frame the caller sets every item (rect, line or text) under a key and
+    then calls present(). Items whose description did not change are left on
+    screen; changed ones are erased with the static background, redrawn and
+    pushed with pygame.display.update(dirty_rects).
+    """
+    def __init__(self, screen, background, font_size=36, text_background=WHITE):
+        self.screen = screen
+        self.background = background
+        self.text_cache = TextCache(font_size, text_background)
+        self.pending = OrderedDict()
+        self.drawn = {}  # key -> (spec, rect on screen)
+
+        self.screen.blit(self.background, (0, 0))
+        pygame.display.flip()
+
+    def set_rect(self, key, color, rect):
+        self.pending[key] = ("rect", color, tuple(rect))
+
+    def set_line(self, key, color, start, end, width=1):
+        self.pending[key] = ("line", color, tuple(start), tuple(end), width)
+
+    def set_text(self, key, text, pos, color=BLACK):
+        self.pending[key] = ("text", text, tuple(pos), color)
+
+    def draw(self, spec):
+        kind = spec[0]
+        if kind == "rect":
+            return pygame.draw.rect(self.screen, spec[1], spec[2])
+        if kind == "line":
+            return pygame.draw.line(self.screen, spec[1], spec[2], spec[3], spec[4])
+        return self.screen.blit(self.text_cache.render(spec[1], spec[3]), spec[2])
+
+    def present(self):
+        dirty = []
+
+        # Erase items that changed or disappeared
+        for key, (spec, rect) in list(self.drawn.items()):
+            if self.pending.get(key) != spec:
+                self.screen.blit(self.background, rect, rect)
+                dirty.append(rect)
+                if key not in self.pending:
+                    del self.drawn[key]
+
+        # Redraw changed items and anything overlapping a repainted area, in order
+        for key, spec in self.pending.items():
+            previous = self.drawn.get(key)
+            if previous is not None and previous[0] == spec and previous[1].collidelist(dirty) == -1:
+                continue
+            rect = self.draw(spec)
+            self.drawn[key] = (spec, rect)
+            dirty.append(rect)
+
+        self.pending.clear()
+        if dirty:
+            pygame.display.update(dirty)
+        return dirty
@@ -2,15 +2,11 @@ import pygame
 import time
 import random
 import math
-
-# Initialize Pygame
-pygame.init()
+from renderer import SceneRenderer
 
 # Screen settings
 WIDTH = 800
 HEIGHT = 600
-screen = pygame.display.set_mode((WIDTH, HEIGHT))
-pygame.display.set_caption("UAV Simulator-Test")
 
 # Colors
 WHITE = (255, 255, 255)
@@ -62,58 +58,60 @@ class Drone:
             # Reduce thrust if overshooting
             self.thrust = max((self.mass * self.gravity) - (error * 0.05), 0)
 
-    def draw(self, screen):
-        pygame.draw.rect(screen, BLUE, 
+    def draw(self, renderer):
+        renderer.set_rect("drone", BLUE, 
                         (WIDTH//2 - self.width//2, 
                          int(self.pos_y), 
                          self.width, 
                          self.height))
         # Draw target altitude line
-        pygame.draw.line(screen, RED, (0, self.target_altitude), 
+        renderer.set_line("target", RED, (0, self.target_altitude), 
                         (WIDTH, self.target_altitude), 2)
 
-# Simulation parameters
-drone = Drone()
-clock = pygame.time.Clock()
-running = True
-dt = 0.1  # Time step in seconds
+def main():
+    # Initialize Pygame and the window only when run as a script
+    pygame.init()
+    screen = pygame.display.set_mode((WIDTH, HEIGHT))
+    pygame.display.set_caption("UAV Simulator-Test")
 
-# Main simulation loop
-while running:
-    for event in pygame.event.get():
-        if event.type == pygame.QUIT:
-            running = False
-        elif event.type == pygame.KEYDOWN:
-            if event.key == pygame.K_SPACE and drone.landed:
-                drone.landed = False  # Trigger takeoff
+    # Simulation parameters
+    drone = Drone()
+    clock = pygame.time.Clock()
+    running = True
+    dt = 0.1  # Time step in seconds
 
-    # Clear screen
-    screen.fill(WHITE)
+    # Static scene (background and ground), drawn once
+    background = pygame.Surface((WIDTH, HEIGHT))
+    background.fill(WHITE)
+    pygame.draw.rect(background, BLACK, (0, HEIGHT-30, WIDTH, 30))
+    renderer = SceneRenderer(screen, background)
 
-    # Update drone
-    drone.autonomous_takeoff()
-    drone.apply_physics(dt)
+    # Main simulation loop
+    while running:
+        for event in pygame.event.get():
+            if event.type == pygame.QUIT:
+                running = False
+            elif event.type == pygame.KEYDOWN:
+                if event.key == pygame.K_SPACE and drone.landed:
+                    drone.landed = False  # Trigger takeoff
 
-    # Draw elements
-    drone.draw(screen)
-    
-    # Draw ground
-    pygame.draw.rect(screen, BLACK, (0, HEIGHT-30, WIDTH, 30))
+        # Update drone
+        drone.autonomous_takeoff()
+        drone.apply_physics(dt)
+
+        # Draw elements (only changed items are repainted)
+        drone.draw(renderer)
     
-    # Display info
-    font = pygame.font.Font(None, 36)
-    altitude_text = font.render(f"Altitude: {HEIGHT - drone.pos_y:.1f}px", 
-                              True, BLACK)
-    velocity_text = font.render(f"Velocity: {drone.velocity:.2f}m/s", 
-                              True, BLACK)
-    thrust_text = font.render(f"Thrust: {drone.thrust:.2f}N", 
-                            True, BLACK)
-    screen.blit(altitude_text, (10, 10))
-    screen.blit(velocity_text, (10, 50))
-    screen.blit(thrust_text, (10, 90))
+        # Display info
+        renderer.set_text("altitude", f"Altitude: {HEIGHT - drone.pos_y:.1f}px", (10, 10))
+        renderer.set_text("velocity", f"Velocity: {drone.velocity:.2f}m/s", (10, 50))
+        renderer.set_text("thrust", f"Thrust: {drone.thrust:.2f}N", (10, 90))
+
+        # Update display, pushing only the dirty rectangles
+        renderer.present()
+        clock.tick(60)  # 60 FPS
 
-    # Update display
-    pygame.display.flip()
-    clock.tick(60)  # 60 FPS
+    pygame.quit()
 
-pygame.quit()
\ No newline at end of file
+if __name__ == "__main__":
+    main()
\ No newline at end of file
@@ -2,6 +2,7 @@ import numpy as np
 import matplotlib.pyplot as plt
 from matplotlib.animation import FuncAnimation
 import time
+from bisect import bisect_left
 
 class DroneSimulator:
     def __init__(self):
@@ -74,48 +75,81 @@ class DroneSimulator:
                 
         return thrust
 
-    def simulate(self):
-        """Run the simulation"""
-        fig, (ax1, ax2) = plt.subplots(2, 1, figsize=(10, 8))
+    def landing_complete(self):
+        return self.state == "landing" and self.height < 0.1 and abs(self.velocity) < 0.1
+
+    def step(self):
+        """Advance one control + physics step and log it"""
+        thrust = self.control_logic()
+        self.update_physics(thrust)
+        
+        # Log data
+        self.time_history.append(self.time)
+        self.height_history.append(self.height)
+        self.thrust_history.append(thrust)
+
+    def simulate(self, steps_per_frame=5, window=10.0, interval=20):
+        """Run the simulation with a live plot.
+
+        Each animation frame advances steps_per_frame physics steps, so the
+        physics rate no longer depends on the redraw rate. Only the last
+        window seconds are redrawn, and the plot lines are updated in place
+        with blitting instead of being re-plotted.
+        """
+        fig, (ax1, ax2) = plt.subplots(2, 1, figsize=(10, 8), sharex=True)
+        
+        # Create the artists once
+        height_line, = ax1.plot([], [], 'b-', label='Height')
+        ax1.set_ylabel('Height (m)')
+        ax1.set_title('Drone State')
+        ax1.grid(True)
+        ax1.set_ylim(0, self.target_height * 1.5)
+        ax1.legend(loc='upper right')
+        state_text = ax1.text(0.02, 0.92, '', transform=ax1.transAxes)
+        
+        thrust_line, = ax2.plot([], [], 'r-', label='Thrust')
+        ax2.set_xlabel('Time (s)')
+        ax2.set_ylabel('Thrust (N)')
+        ax2.grid(True)
+        ax2.set_ylim(0, self.max_thrust * 1.2)
+        ax2.legend(loc='upper right')
+        ax2.set_xlim(0, window)
+        artists = (height_line, thrust_line, state_text)
+        
+        def init():
+            height_line.set_data([], [])
+            thrust_line.set_data([], [])
+            state_text.set_text('')
+            return artists
         
         def animate(frame):
-            # Clear previous frame
-            ax1.cla()
-            ax2.cla()
-            
-            # Calculate control input
-            thrust = self.control_logic()
-            
-            # Update physics
-            self.update_physics(thrust)
-            
-            # Log data
-            self.time_history.append(self.time)
-            self.height_history.append(self.height)
-            self.thrust_history.append(thrust)
-            
-            # Plot height
-            ax1.plot(self.time_history, self.height_history, 'b-', label='Height')
-            ax1.set_ylabel('Height (m)')
-            ax1.set_title(f'Drone State: {self.state}')
-            ax1.grid(True)
-            ax1.set_ylim(0, self.target_height * 1.5)
-            ax1.legend()
+            for _ in range(steps_per_frame):
+                self.step()
+                # Stop simulation when landing is complete
+                if self.landing_complete():
+                    ani.event_source.stop()
+                    break
             
-            # Plot thrust
-            ax2.plot(self.time_history, self.thrust_history, 'r-', label='Thrust')
-            ax2.set_xlabel('Time (s)')
-            ax2.set_ylabel('Thrust (N)')
-            ax2.grid(True)
-            ax2.set_ylim(0, self.max_thrust * 1.2)
-            ax2.legend()
+            # Slide the time window forward; this needs one full redraw. It must
+            # be synchronous: the blit cache is refreshed from the canvas as soon
+            # as we return, and draw_idle would leave the old axes in it
+            xmin, xmax = ax2.get_xlim()
+            if self.time > xmax:
+                xmin = self.time - window / 2
+                ax2.set_xlim(xmin, xmin + window)
+                fig.canvas.draw()
             
-            # Stop simulation when landing is complete
-            if self.state == "landing" and self.height < 0.1 and abs(self.velocity) < 0.1:
-                ani.event_source.stop()
+            # Only the samples inside the visible window are handed to the lines
+            start = bisect_left(self.time_history, xmin)
+            times = self.time_history[start:]
+            height_line.set_data(times, self.height_history[start:])
+            thrust_line.set_data(times, self.thrust_history[start:])
+            state_text.set_text(f'State: {self.state}')
+            return artists
 
         # Create animation
-        ani = FuncAnimation(fig, animate, frames=None, interval=10, repeat=False)
+        ani = FuncAnimation(fig, animate, init_func=init, frames=None, interval=interval,
+                            blit=True, repeat=False, cache_frame_data=False)
         plt.tight_layout()
         plt.show()
 